@@ -4,10 +4,14 @@ Excel column word counter with tag stripping functionality
 
 import pandas as pd
 import os
-import glob
-import re
+import sys
 from datetime import datetime
 
+# Share the directory walker and string analysis with the word counters
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'word_counter'))
+from file_walker import walk_files
+from string_analysis import analyze_string, cache_stats
+
 
 class ExcelColumnCounter:
 	"""Extract and count words from specific Excel columns, stripping tags"""
@@ -46,19 +50,9 @@ class ExcelColumnCounter:
 		if not self.strip_tags:
 			return text
 
-		# Remove HTML tags: <b>text</b>, <i>text</i>
-		text = re.sub(r'<[^>]+>', '', text)
-
-		# Remove Unity-style tags: <color=red>text</color>
-		text = re.sub(r'<[^>]+>[^<]*</[^>]+>', lambda m: re.sub(r'<[^>]+>|</[^>]+>', '', m.group()), text)
-
-		# Remove placeholders: {variable}, {{name}}
-		text = re.sub(r'\{[^}]+\}', '', text)
-
-		# Remove extra whitespace
-		text = ' '.join(text.split())
-
-		return text
+		# Tags (<b>, <color=red>) and placeholders ({variable}, {{name}}) are removed,
+		# whitespace collapsed; repeated strings are served from the shared cache
+		return analyze_string(text).cleaned
 
 	def find_text_column(self, df):
 		"""Find which column contains the translatable text"""
@@ -97,16 +91,20 @@ class ExcelColumnCounter:
 			# Extract text from the column
 			text_data = df[text_column].dropna()
 
-			# Count words with and without tags
-			words_with_tags = sum(len(str(text).split()) for text in text_data)
-
-			# Clean tags and count again
-			cleaned_texts = [self.clean_text(text) for text in text_data]
-			words_without_tags = sum(len(text.split()) for text in cleaned_texts if text)
-
-			# Count how many strings had tags
-			strings_with_tags = sum(1 for original, cleaned in zip(text_data, cleaned_texts)
-									if str(original) != cleaned)
+			# Count words with and without tags from one analysis per string
+			words_with_tags = 0
+			words_without_tags = 0
+			strings_with_tags = 0
+			for text in text_data:
+				text = str(text)
+				analysis = analyze_string(text)
+				words_with_tags += analysis.words
+				if not self.strip_tags:
+					words_without_tags += analysis.words
+					continue
+				words_without_tags += analysis.clean_words
+				if analysis.cleaned != ' '.join(text.split()):
+					strings_with_tags += 1
 
 			result = {
 				'filename': filename,
@@ -130,27 +128,37 @@ class ExcelColumnCounter:
 			print(f"  ✗ Error processing {filename}: {e}")
 			return None
 
-	def count_folder(self, folder_path, column_name=None):
-		"""Count words in all Excel files in a folder"""
-		excel_files = []
-		for pattern in ['*.xlsx', '*.xls']:
-			excel_files.extend(glob.glob(os.path.join(folder_path, pattern)))
+	def count_folder(self, folder_path, column_name=None, exclude=None, recursive=True):
+		"""Count words in all Excel files in a folder and its subfolders
 
-		if not excel_files:
-			print(f"No Excel files found in {folder_path}")
-			return
+		Args:
+			folder_path: Folder to scan
+			column_name: Column to count (default: auto-detect)
+			exclude: Glob patterns for files/folders to skip (a .locignore file works too)
+			recursive: Include subfolders
+		"""
+		# Skip Excel's ~$ lock files
+		excel_files = walk_files(folder_path, include=['*.xlsx', '*.xls'],
+								 exclude=['~$*'] + list(exclude or []), recursive=recursive)
 
-		print(f"\nFound {len(excel_files)} Excel file(s)\n")
 		print("=" * 70)
 
 		self.results = []
+		files_found = 0
 
 		for filepath in excel_files:
+			files_found += 1
 			result = self.count_words_in_file(filepath, column_name)
 			if result:
 				self.results.append(result)
 			print()
 
+		if not files_found:
+			print(f"No Excel files found in {folder_path}")
+			return
+
+		print(f"Found {files_found} Excel file(s)\n")
+
 	def display_summary(self):
 		"""Display summary of results"""
 		if not self.results:
@@ -189,6 +197,8 @@ class ExcelColumnCounter:
 		print(f"Strings with tags: {total_tagged}")
 		print(f"Total words (clean): {total_words:,}")
 		print(f"Estimated cost: ${estimated_cost:,.2f} (at ${cost_per_word}/word)")
+		stats = cache_stats()
+		print(f"String cache: {stats['hit_rate']:.0%} hit rate ({stats['hits']:,} hits, {stats['size']:,} distinct strings)")
 		print("=" * 80)
 
 	def export_to_excel(self, output_filename=None):
@@ -0,0 +1,224 @@
+"""
+QA for Excel string tables (source, target and Character_Limit in one sheet)
+
+Rows are streamed once with openpyxl's read-only mode; every target column (EN, JP)
+goes through the same checks as run_qa_audit plus the row's Character_Limit, and
+the sheet is written back as a highlighted copy in write-only mode, so 500k-row
+workbooks never have to fit in memory.
+
+Usage:
+	python excel_qa.py <workbook.xlsx> [target columns, default EN,JP]
+"""
+
+import os
+import sys
+from openpyxl import Workbook, load_workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import PatternFill
+
+from qa_auditor import audit_strings, _issue, InputError, INPUT_ERRORS
+from string_analysis import analyze_string
+
+# Header names of the source text column (matched case-insensitively)
+SOURCE_COLUMNS = ['Korean', 'KO', 'Source', 'Source Text']
+DEFAULT_TARGET_COLUMNS = ['EN', 'JP']
+LIMIT_COLUMN = 'Character_Limit'
+
+# Target column names that are country rather than language codes
+COLUMN_LANGUAGES = {'jp': 'ja', 'kr': 'ko', 'cn': 'zh', 'tw': 'zh'}
+
+# Cell highlight per severity, most severe first
+SEVERITY_FILLS = {
+	'CRITICAL': PatternFill('solid', fgColor='FFC7CE'),
+	'High': PatternFill('solid', fgColor='FFEB9C'),
+	'Warning': PatternFill('solid', fgColor='FFF2CC'),
+}
+
+
+def _find_column(header, names):
+	lowered = [str(name).strip().lower() if name is not None else '' for name in header]
+	for name in names:
+		if name.lower() in lowered:
+			return lowered.index(name.lower())
+	return None
+
+
+def _key_column(header):
+	"""String ID column: the first header ending in ID or Key, else the first column"""
+	for index, name in enumerate(header):
+		name = str(name or '').strip().lower()
+		if name in ('id', 'key') or name.endswith(('_id', ' id', '_key', ' key')):
+			return index
+	return 0
+
+
+def check_length_limit(target_text, limit):
+	"""Flag targets longer than the row's character limit (tags and placeholders not counted)
+
+	Returns:
+		List of (issue, severity)
+	"""
+	try:
+		limit = int(limit)
+	except (TypeError, ValueError):
+		return []
+	length = len(analyze_string(target_text).cleaned)
+	if limit > 0 and length > limit:
+		return [(f"Character Limit Exceeded ({length}/{limit})", "High")]
+	return []
+
+
+def audit_sheet_rows(rows, target_columns=None, glossary=None, sheet_name=''):
+	"""Audit the rows of one sheet as they stream in
+
+	Args:
+		rows: Iterator of row value tuples, header first
+		target_columns: Target column names (default: EN, JP)
+
+	Yields:
+		(row values, {column index: [issue dicts]}) for every row, header included
+	"""
+	rows = iter(rows)
+	header = next(rows, None)
+	if header is None:
+		return
+	yield header, {}
+
+	source_index = _find_column(header, SOURCE_COLUMNS)
+	targets = [(index, str(header[index]).strip())
+			   for index in (_find_column(header, [name]) for name in target_columns or DEFAULT_TARGET_COLUMNS)
+			   if index is not None]
+	limit_index = _find_column(header, [LIMIT_COLUMN])
+	key_index = _key_column(header)
+
+	for row_number, row in enumerate(rows, 2):
+		source_text = row[source_index] if source_index is not None and source_index < len(row) else None
+		if source_index is None or source_text is None or not str(source_text).strip():
+			yield row, {}
+			continue
+
+		source_text = str(source_text)
+		key = row[key_index] if key_index < len(row) and row[key_index] is not None else f"row {row_number}"
+		key = f"{sheet_name}!{key}" if sheet_name else str(key)
+		limit = row[limit_index] if limit_index is not None and limit_index < len(row) else None
+
+		flagged = {}
+		for index, column in targets:
+			value = row[index] if index < len(row) else None
+			target_text = "" if value is None else str(value)
+			language = COLUMN_LANGUAGES.get(column.lower(), column.lower())
+
+			issues = audit_strings({key: source_text}, {key: target_text}, glossary, language)
+			if target_text.strip():
+				for issue, severity in check_length_limit(target_text, limit):
+					issues.append(_issue(key, issue, severity, source_text, target_text))
+			for issue in issues:
+				issue['Column'] = column
+				issue['Row'] = row_number
+			if issues:
+				flagged[index] = issues
+		yield row, flagged
+
+
+def _read_rows(sheet):
+	"""Yield a sheet's row values; read and parse errors are raised as InputError
+
+	Read-only sheets are parsed while their rows are checked, so only errors from
+	reading the rows are wrapped, not errors from the checks.
+	"""
+	rows = sheet.iter_rows(values_only=True)
+	while True:
+		try:
+			row = next(rows)
+		except StopIteration:
+			return
+		except INPUT_ERRORS as e:
+			raise InputError(f"{type(e).__name__}: {e}") from e
+		yield row
+
+
+def audit_workbook(filepath, target_columns=None, glossary=None, output_file=None, highlight=True, emit=None):
+	"""Audit every sheet of an Excel string table and write a highlighted copy
+
+	Sheets without a source column are copied unchanged. In the copy, flagged target
+	cells are filled by their most severe issue and a 'QA Issues' column lists the
+	issues of each row.
+
+	Args:
+		filepath: Workbook to audit (.xlsx)
+		target_columns: Target column names (default: EN, JP)
+		glossary: Optional Glossary for terminology checks
+		output_file: Highlighted copy (default: <name>_QA.xlsx next to the workbook)
+		highlight: Write the highlighted copy
+		emit: Optional callback(issue dict) receiving issues as each row is checked;
+			when given, issues are not collected, so memory stays flat on large tables
+
+	Returns:
+		(list of issue dicts with Column and Row, or None with emit; path of the
+		highlighted copy or None)
+	Raises:
+		InputError: The workbook could not be read or parsed
+	"""
+	report_list = [] if emit is None else None
+	try:
+		source_book = load_workbook(filepath, read_only=True)
+	except INPUT_ERRORS as e:
+		raise InputError(f"{type(e).__name__}: {e}") from e
+	output_book = Workbook(write_only=True) if highlight else None
+
+	try:
+		for source_sheet in source_book.worksheets:
+			print(f" Checking sheet: {source_sheet.title}")
+			output_sheet = output_book.create_sheet(source_sheet.title) if highlight else None
+
+			rows = audit_sheet_rows(_read_rows(source_sheet), target_columns, glossary,
+									sheet_name=source_sheet.title if len(source_book.sheetnames) > 1 else '')
+			for row_number, (row, flagged) in enumerate(rows, 1):
+				row_issues = [issue for issues in flagged.values() for issue in issues]
+				if emit is None:
+					report_list.extend(row_issues)
+				else:
+					for issue in row_issues:
+						emit(issue)
+				if not highlight:
+					continue
+
+				if not row_issues and row_number > 1:
+					output_sheet.append(row)
+					continue
+
+				cells = []
+				for index, value in enumerate(row):
+					cell = WriteOnlyCell(output_sheet, value=value)
+					if index in flagged:
+						severities = {issue['Severity'] for issue in flagged[index]}
+						cell.fill = next(fill for severity, fill in SEVERITY_FILLS.items() if severity in severities)
+					cells.append(cell)
+				if row_number == 1:
+					cells.append(WriteOnlyCell(output_sheet, value='QA Issues'))
+				else:
+					summary = '; '.join(f"{issue['Column']}: {issue['Issue']}" for issue in row_issues)
+					cells.append(WriteOnlyCell(output_sheet, value=summary))
+				output_sheet.append(cells)
+	finally:
+		source_book.close()
+
+	if not highlight:
+		return report_list, None
+
+	if not output_file:
+		stem, _ = os.path.splitext(filepath)
+		output_file = f"{stem}_QA.xlsx"
+	output_book.save(output_file)
+	print(f"\n✓ Highlighted copy saved: {output_file}")
+	return report_list, output_file
+
+
+if __name__ == '__main__':
+	if len(sys.argv) not in (2, 3):
+		print(__doc__)
+		sys.exit(1)
+
+	columns = sys.argv[2].split(',') if len(sys.argv) == 3 else None
+	issues, _ = audit_workbook(sys.argv[1], columns)
+	print(f"Found {len(issues):,} issue(s) in {os.path.basename(sys.argv[1])}")
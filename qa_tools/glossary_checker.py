@@ -0,0 +1,204 @@
+"""
+Glossary (terminology) checks backed by an Aho-Corasick automaton
+
+The source side of the glossary is compiled once into an Aho-Corasick automaton,
+so every term hit of a string is found in one linear scan of the string however
+many terms the glossary has. For each term found in the source, the target must
+contain one of the approved target terms.
+
+Matching is case-insensitive. Terms starting or ending with a Latin letter or digit
+only match whole words ("Fire" does not match "Firewall"); other scripts match
+anywhere, so Korean terms still match with particles attached (화염구를).
+
+Glossary files:
+	CSV: 'Source' and 'Target' columns, or the first two columns of a file without
+	     a Source/Target header row
+	JSON: {"source term": "target term"} or {"source term": ["target", "alternative"]}
+	Alternative target terms are separated by '|' in either format.
+
+Usage:
+	python glossary_checker.py <glossary.csv|json> <source.json> <target.json>
+"""
+
+import os
+import sys
+import csv
+import json
+import hashlib
+import itertools
+from collections import deque
+
+TARGET_SEPARATOR = '|'
+
+
+def _is_word_char(char):
+	"""Latin letters and digits, which need word boundaries around a term"""
+	return char.isascii() and char.isalnum()
+
+
+class Glossary:
+	"""Aho-Corasick automaton over the source terms of a glossary"""
+
+	def __init__(self, entries):
+		"""
+		Args:
+			entries: {source term: target term or list of approved target terms}
+		"""
+		# term id -> (source term, approved targets, casefolded targets)
+		self.terms = []
+		self._lengths = []
+		self._goto = [{}]
+		self._fail = [0]
+		self._out = [()]
+
+		ids = {}
+		for source_term, targets in entries.items():
+			if isinstance(targets, str):
+				targets = targets.split(TARGET_SEPARATOR)
+			targets = tuple(target.strip() for target in targets if target.strip())
+			folded = source_term.strip().casefold()
+			if not folded or not targets:
+				continue
+			if folded in ids:
+				# Same term listed twice: accept the targets of both rows
+				term, old_targets, old_folded = self.terms[ids[folded]]
+				self.terms[ids[folded]] = (term, old_targets + targets,
+										   old_folded + tuple(t.casefold() for t in targets))
+				continue
+			ids[folded] = len(self.terms)
+			self.terms.append((source_term.strip(), targets, tuple(t.casefold() for t in targets)))
+			self._lengths.append(len(folded))
+			self._insert(folded, ids[folded])
+		self._build_failure_links()
+
+		digest = hashlib.blake2b(digest_size=8)
+		for term, targets, _ in self.terms:
+			digest.update('\x00'.join((term,) + targets).encode('utf-8') + b'\x01')
+		self.version = digest.hexdigest()
+
+	def __len__(self):
+		return len(self.terms)
+
+	def _insert(self, folded, term_id):
+		node = 0
+		for char in folded:
+			next_node = self._goto[node].get(char)
+			if next_node is None:
+				next_node = len(self._goto)
+				self._goto[node][char] = next_node
+				self._goto.append({})
+				self._fail.append(0)
+				self._out.append(())
+			node = next_node
+		self._out[node] = (term_id,)
+
+	def _build_failure_links(self):
+		"""Breadth-first pass linking each node to its longest proper suffix in the trie"""
+		goto, fail, out = self._goto, self._fail, self._out
+		queue = deque(goto[0].values())
+		while queue:
+			node = queue.popleft()
+			for char, child in goto[node].items():
+				state = fail[node]
+				while state and char not in goto[state]:
+					state = fail[state]
+				fail[child] = goto[state].get(char, 0)
+				# Terms ending at the suffix also end here
+				out[child] = out[child] + out[fail[child]]
+				queue.append(child)
+
+	def find_terms(self, text):
+		"""Return the glossary terms in a string, as (start, end, term id)
+
+		Overlapping hits are resolved leftmost-longest, so "화염구" wins over "화염".
+		"""
+		folded = text.casefold()
+		goto, fail, out, lengths = self._goto, self._fail, self._out, self._lengths
+		hits = []
+		node = 0
+		for end, char in enumerate(folded, 1):
+			while node and char not in goto[node]:
+				node = fail[node]
+			node = goto[node].get(char, 0)
+			for term_id in out[node]:
+				start = end - lengths[term_id]
+				if _is_word_char(folded[start]) and start > 0 and _is_word_char(folded[start - 1]):
+					continue
+				if _is_word_char(folded[end - 1]) and end < len(folded) and _is_word_char(folded[end]):
+					continue
+				hits.append((start, end, term_id))
+
+		hits.sort(key=lambda hit: (hit[0], hit[0] - hit[1]))
+		selected = []
+		covered = 0
+		for start, end, term_id in hits:
+			if start >= covered:
+				selected.append((start, end, term_id))
+				covered = end
+		return selected
+
+	def check(self, source_text, target_text):
+		"""Check that every glossary term of the source has an approved rendering in the target
+
+		Returns:
+			List of (issue, severity), one per mismatched term
+		"""
+		issues = []
+		folded_target = None
+		seen = set()
+		for _, _, term_id in self.find_terms(source_text):
+			if term_id in seen:
+				continue
+			seen.add(term_id)
+			term, targets, folded_targets = self.terms[term_id]
+			if folded_target is None:
+				folded_target = target_text.casefold()
+			if not any(target in folded_target for target in folded_targets):
+				issues.append((f"Glossary Term Mismatch: {term} → {' / '.join(targets)}", "High"))
+		return issues
+
+
+def load_glossary(path):
+	"""Load a Glossary from a CSV or JSON file"""
+	if path.lower().endswith('.json'):
+		with open(path, 'r', encoding='utf-8') as f:
+			return Glossary(json.load(f))
+
+	entries = {}
+	with open(path, 'r', encoding='utf-8-sig', newline='') as f:
+		rows = csv.reader(f)
+		first_row = next(rows, [])
+		header = [column.strip().lower() for column in first_row]
+		source_index = header.index('source') if 'source' in header else 0
+		target_index = header.index('target') if 'target' in header else 1
+		# Without a Source/Target header the first row is already a term
+		if 'source' not in header and 'target' not in header:
+			rows = itertools.chain([first_row], rows)
+		for row in rows:
+			if len(row) <= max(source_index, target_index):
+				continue
+			source_term, target_term = row[source_index], row[target_index]
+			if source_term.strip() in entries:
+				target_term = entries[source_term.strip()] + TARGET_SEPARATOR + target_term
+			entries[source_term.strip()] = target_term
+	return Glossary(entries)
+
+
+if __name__ == '__main__':
+	if len(sys.argv) != 4:
+		print(__doc__)
+		sys.exit(1)
+
+	from qa_auditor import load_strings
+
+	glossary = load_glossary(sys.argv[1])
+	source_data = load_strings(sys.argv[2])
+	target_data = load_strings(sys.argv[3])
+	print(f"Glossary: {len(glossary):,} term(s) from {os.path.basename(sys.argv[1])}")
+
+	mismatches = 0
+	for key, source_text in source_data.items():
+		for issue, _ in glossary.check(source_text, target_data.get(key, "")):
+			print(f" ⚠️ {key}: {issue}")
+			mismatches += 1
+	print(f"\n{mismatches:,} glossary mismatch(es) in {len(source_data):,} strings")
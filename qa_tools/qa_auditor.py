@@ -1,67 +1,547 @@
-import json
+"""
+Localization QA auditor: compares target strings against source strings
+
+Usage:
+	python qa_auditor.py <source.json> <target.json> [options]
+	python qa_auditor.py <string_table.xlsx> [--columns EN,JP] [options]
+
+Issues are written to stdout as JSON lines and a JSON summary (severity counts,
+timing) to stderr. pandas/openpyxl are only loaded for Excel input or --excel.
+
+Exit codes: 0 no issue at or above --fail-on, 1 Warning, 3 High, 4 CRITICAL
+(the most severe issue found), 2 usage error, 5 unreadable input.
+"""
+
+import os
 import re
-import pandas as pd
+import sys
+import json
+import time
+import zipfile
+import argparse
+import xml.etree.ElementTree as ET
+from contextlib import redirect_stdout
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+# Share the segment extractors and string analysis with the word counters
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'word_counter'))
+from segments import iter_json_segments, segment_hash
+from string_analysis import analyze_string, is_sequential_placeholder
+from qa_fingerprints import string_fingerprint, QAFingerprintStore
+from text_checks import check_text, locale_from_filename
+
+# Bump when the checks change, so incremental audits re-check every key
+RULESET_VERSION = 5
+
+DEFAULT_REPORT_FILE = "Localization_QA_Report.xlsx"
+
+# Least to most severe; exit code of the CLI when that is the worst issue found
+SEVERITY_EXIT_CODES = {"Warning": 1, "High": 3, "CRITICAL": 4}
+EXIT_INPUT_ERROR = 5
+
+# Errors raised while reading or parsing an input file (JSONDecodeError is a ValueError)
+INPUT_ERRORS = (OSError, ValueError, UnicodeError, zipfile.BadZipFile, ET.ParseError)
+
+
+class InputError(Exception):
+	"""An input file of the CLI could not be read or parsed"""
 
 def extract_placeholders(text):
 	"""Find all {tags} and %d/%s placeholders"""
-	pattern = r"\{.*?\}|%\w"
-	return re.findall(pattern, text)
+	return list(analyze_string(text).placeholders)
 
 def extract_html_tags(text):
-	pattern = r"<[^>]*>"
-	return re.findall(pattern, text)
+	return [tag.raw for tag in analyze_string(text).tags]
 
-def run_qa_audit(source_file, target_file):
-	#Load the JSON data
-	with open(source_file, 'r', encoding='utf-8') as f:
-		source_data = json.load(f)
-	with open(target_file, 'r', encoding='utf-8') as f:
-		target_data = json.load(f)
+def load_strings(filepath):
+	"""Load {key: text} from a JSON string file (nested keys become dotted paths)
 
-	report_list = []
+	Invalid UTF-8 bytes are kept as lone surrogates, so the audit reports them per string.
+	"""
+	return {segment.key: segment.text for segment in iter_json_segments(filepath, errors='surrogateescape')}
+
+def _issue(key, issue, severity, source_text, target_text):
+	return {
+		"Key": key,
+		"Issue": issue,
+		"Severity": severity,
+		"Source": source_text,
+		"Target": target_text
+	}
+
+def check_placeholders(source_placeholders, target_placeholders):
+	"""Compare placeholders as multisets, so legitimate reordering is not flagged
+
+	Returns:
+		List of (issue, severity): missing, extra, and reordered argument-order
+		placeholders (%s, %d), which would swap values at runtime
+	"""
+	issues = []
+	source_counts = Counter(source_placeholders)
+	target_counts = Counter(target_placeholders)
+	if source_counts - target_counts:
+		issues.append(("Placeholder Missing", "High"))
+	if target_counts - source_counts:
+		issues.append(("Placeholder Extra", "High"))
+	if not issues:
+		source_order = [ph for ph in source_placeholders if is_sequential_placeholder(ph)]
+		target_order = [ph for ph in target_placeholders if is_sequential_placeholder(ph)]
+		if source_order != target_order:
+			issues.append(("Placeholder Reordered", "High"))
+	return issues
+
+# Attributes whose values are translated, so they may differ from the source
+TRANSLATABLE_ATTRIBUTES = ('alt', 'title', 'aria-label', 'placeholder', 'label')
+
+# Structural tag errors (from the tag stack) -> issue type
+MARKUP_ERROR_ISSUES = {
+	'unclosed': "Unclosed Tag",
+	'unexpected_close': "Unexpected Closing Tag",
+	'misnested': "Tag Nesting Error",
+}
+
+def _preserved_attributes(tag):
+	return tuple(attr for attr in tag.attrs if attr[0] not in TRANSLATABLE_ATTRIBUTES)
+
+def check_markup(source_analysis, target_analysis):
+	"""Compare HTML/Unity markup of a source/target pair
+
+	Tags are compared as multisets of opening and void tags, then by preserved
+	attributes (href, color values, ...); the target's tag stack errors are
+	reported unless the source has the same error.
+
+	Returns:
+		List of (issue, severity)
+	"""
+	issues = []
+	source_tags = [tag for tag in source_analysis.tags if tag.kind != 'close']
+	target_tags = [tag for tag in target_analysis.tags if tag.kind != 'close']
 
+	if Counter(tag.name for tag in source_tags) != Counter(tag.name for tag in target_tags):
+		issues.append(("HTML Tag Corruption", "CRITICAL"))
+	elif (Counter((tag.name, _preserved_attributes(tag)) for tag in source_tags)
+		  != Counter((tag.name, _preserved_attributes(tag)) for tag in target_tags)):
+		issues.append(("Tag Attribute Changed", "CRITICAL"))
+
+	for error in target_analysis.markup_errors:
+		if error not in source_analysis.markup_errors:
+			issues.append((MARKUP_ERROR_ISSUES[error], "CRITICAL"))
+	return issues
+
+def has_translatable_text(text):
+	"""True if a string has letters once tags and placeholders are removed"""
+	return any(char.isalpha() for char in analyze_string(text).cleaned)
+
+def iter_issues(source_data, target_data, glossary=None, language=None):
+	"""Run the QA checks over {key: text} dicts, yielding issues in key order as they are found
+
+	Args:
+		glossary: Optional Glossary; source terms must use an approved target term
+		language: Target language code for the leftover-script check (None: Latin only)
+	"""
 	for key, source_text in source_data.items():
-		target_text = target_data.get(key, "")
+		# 0. Missing, empty and untranslated strings; the other checks would only add noise
+		target_text = target_data.get(key)
+		if target_text is None:
+			yield _issue(key, "Missing Translation", "High", source_text, "")
+			continue
+		if not target_text.strip():
+			if source_text.strip():
+				yield _issue(key, "Empty Translation", "High", source_text, target_text)
+			continue
+		if target_text == source_text and has_translatable_text(source_text):
+			yield _issue(key, "Identical to Source", "Warning", source_text, target_text)
+
+		source_analysis = analyze_string(source_text)
+		target_analysis = analyze_string(target_text)
 
 		# 1. Placeholder check
-		s_ph = extract_placeholders(source_text)
-		t_ph = extract_placeholders(target_text)
-		if s_ph != t_ph:
-			report_list.append({
-				"Key": key,
-				"Issue": "Placeholder Missing",
-				"Severity": "High",
-				"Source": source_text,
-				"Target": target_text
-			})
-
-		# 2. HTML Integrity check
-		s_tags = extract_html_tags(source_text)
-		t_tags = extract_html_tags(target_text)
-		if s_tags != t_tags:
-			report_list.append({
-				"Key": key,
-				"Issue": "HTML Tag Corruption",
-				"Severity": "CRITICAL",
-				"Source": source_text,
-				"Target": target_text
-			})
+		for issue, severity in check_placeholders(source_analysis.placeholders, target_analysis.placeholders):
+			yield _issue(key, issue, severity, source_text, target_text)
+
+		# 2. HTML/Unity markup check: tags, attributes and structure
+		for issue, severity in check_markup(source_analysis, target_analysis):
+			yield _issue(key, issue, severity, source_text, target_text)
 
 		# 3. Length/Expansion check (Flag if target is > *2 source length
 		if len(target_text) > (len(source_text) * 2):
-			report_list.append({
-				"Key": key,
-				"Issue": "Potential UI Overflow",
-				"Severity": "Warning",
-				"Source": source_text,
-				"Target": target_text
-			})
-
-	df = pd.DataFrame(report_list)
-	if not df.empty:
-		df.to_excel("Localization_QA_Report.xlsx", index=False)
-		print(f"Report generated with {len(df)} issues.")
+			yield _issue(key, "Potential UI Overflow", "Warning", source_text, target_text)
+
+		# 4. Glossary check
+		if glossary is not None:
+			for issue, severity in glossary.check(source_text, target_text):
+				yield _issue(key, issue, severity, source_text, target_text)
+
+		# 5. Script and encoding checks
+		for issue, severity in check_text(source_text, target_text, language):
+			yield _issue(key, issue, severity, source_text, target_text)
+
+def audit_strings(source_data, target_data, glossary=None, language=None):
+	"""Run the QA checks over {key: text} dicts and return the list of issues"""
+	return list(iter_issues(source_data, target_data, glossary, language))
+
+# Keys per worker task in parallel audits
+QA_CHUNK_SIZE = 20000
+
+# Set once per worker process, so the glossary automaton is not re-sent with every chunk
+_worker_glossary = None
+
+def _init_worker(glossary):
+	global _worker_glossary
+	_worker_glossary = glossary
+
+def _audit_chunk(source_chunk, target_chunk, language):
+	return audit_strings(source_chunk, target_chunk, _worker_glossary, language)
+
+def _iter_chunks(source_data, target_data, chunk_size):
+	"""Split source keys into consecutive chunks, with the matching target strings"""
+	items = iter(source_data.items())
+	while True:
+		source_chunk = dict(islice(items, chunk_size))
+		if not source_chunk:
+			return
+		target_chunk = {key: target_data[key] for key in source_chunk if key in target_data}
+		yield source_chunk, target_chunk
+
+def audit_strings_parallel(source_data, target_data, workers=None, chunk_size=QA_CHUNK_SIZE, glossary=None,
+						   language=None):
+	"""Run audit_strings over chunks of keys in worker processes
+
+	Chunk results are merged in key order, so the report is identical to a serial run.
+
+	Args:
+		workers: Number of worker processes (default: CPU count, 1 to audit inline)
+		chunk_size: Keys per worker task
+		glossary: Optional Glossary for the terminology check
+		language: Target language code for the leftover-script check
+	"""
+	workers = workers or os.cpu_count() or 1
+	if workers == 1 or len(source_data) <= chunk_size:
+		return audit_strings(source_data, target_data, glossary, language)
+
+	report_list = []
+	# Bounded window of in-flight chunks keeps memory flat on large tables
+	with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(glossary,)) as executor:
+		pending = deque()
+		for source_chunk, target_chunk in _iter_chunks(source_data, target_data, chunk_size):
+			pending.append(executor.submit(_audit_chunk, source_chunk, target_chunk, language))
+			if len(pending) >= workers * 2:
+				report_list.extend(pending.popleft().result())
+		while pending:
+			report_list.extend(pending.popleft().result())
+	return report_list
+
+def audit_strings_incremental(source_data, target_data, fingerprints, locale, workers=1, glossary=None,
+							  language=None):
+	"""Re-check only keys whose source, target or ruleset changed since the last audit
+
+	Issues of unchanged keys are carried forward from the fingerprint store, and the
+	store is updated with the re-checked keys.
+
+	Args:
+		fingerprints: QAFingerprintStore
+		locale: Store partition for this target (e.g. the target file name)
+		workers: Worker processes for the re-checked keys
+		glossary: Optional Glossary; editing the glossary re-checks every key
+		language: Target language code for the leftover-script check
+
+	Returns:
+		(list of issues in key order, number of re-checked keys)
+	"""
+	previous = fingerprints.load(locale)
+	ruleset = f"{RULESET_VERSION}:{language}"
+	if glossary is not None:
+		ruleset += f":{glossary.version}"
+	changed_source = {}
+	changed_target = {}
+	changed_fingerprints = {}
+	for key, source_text in source_data.items():
+		target_text = target_data.get(key)
+		fingerprint = string_fingerprint(source_text, target_text, ruleset)
+		stored = previous.get(key)
+		if stored is None or stored[0] != fingerprint:
+			changed_source[key] = source_text
+			if target_text is not None:
+				changed_target[key] = target_text
+			changed_fingerprints[key] = fingerprint
+
+	new_issues = {key: [] for key in changed_source}
+	for issue in audit_strings_parallel(changed_source, changed_target, workers, glossary=glossary,
+										language=language):
+		new_issues[issue["Key"]].append((issue["Issue"], issue["Severity"]))
+
+	report_list = []
+	for key, source_text in source_data.items():
+		issues = new_issues[key] if key in new_issues else previous[key][1]
+		target_text = target_data.get(key, "")
+		for issue, severity in issues:
+			report_list.append(_issue(key, issue, severity, source_text, target_text))
+
+	fingerprints.update(locale,
+						((key, changed_fingerprints[key], issues) for key, issues in new_issues.items()),
+						removed=[key for key in previous if key not in source_data])
+	return report_list, len(changed_source)
+
+# Cross-string checks: (issue, which side is shared, which side differs)
+CONSISTENCY_CHECKS = [
+	("Inconsistent Translation", 'Source', 'Target'),
+	("Inconsistent Source", 'Target', 'Source'),
+]
+
+def _iter_pair_hashes(source_data, target_data):
+	"""Yield (key, source hash, target hash) of translated keys, whitespace-normalized"""
+	for key, source_text in source_data.items():
+		target_text = target_data.get(key, "")
+		if source_text.strip() and target_text.strip():
+			yield key, segment_hash(source_text), segment_hash(target_text)
+
+def check_consistency(source_data, target_data):
+	"""Flag identical sources translated differently and identical targets from different sources
+
+	The first pass keeps one entry per unique string and finds the conflicting hashes;
+	the second collects only the keys of conflicting groups.
+
+	Returns:
+		(list of issues in key order, list of conflict rows: Check, Group, Key, Source, Target)
+	"""
+	first_seen = ({}, {})
+	conflicting = (set(), set())
+	for _, source_hash, target_hash in _iter_pair_hashes(source_data, target_data):
+		for side, (shared, other) in enumerate(((source_hash, target_hash), (target_hash, source_hash))):
+			if first_seen[side].setdefault(shared, other) != other:
+				conflicting[side].add(shared)
+
+	report_list = []
+	groups = ({}, {})
+	if conflicting[0] or conflicting[1]:
+		for key, source_hash, target_hash in _iter_pair_hashes(source_data, target_data):
+			for side, shared in enumerate((source_hash, target_hash)):
+				if shared in conflicting[side]:
+					groups[side].setdefault(shared, []).append(key)
+					issue = CONSISTENCY_CHECKS[side][0]
+					report_list.append(_issue(key, issue, "Warning", source_data[key], target_data[key]))
+
+	conflicts = []
+	for side, (issue, shared_column, _) in enumerate(CONSISTENCY_CHECKS):
+		for group, keys in enumerate(groups[side].values(), 1):
+			for key in keys:
+				conflicts.append({
+					"Check": issue,
+					"Group": group,
+					"Shared": shared_column,
+					"Key": key,
+					"Source": source_data[key],
+					"Target": target_data[key],
+				})
+	return report_list, conflicts
+
+# Characters Excel and Parquet cannot store (control characters, undecodable bytes)
+_UNSTORABLE_CHARS = re.compile('[\x00-\x08\x0b\x0c\x0e-\x1f\ud800-\udfff]')
+
+def _storable(rows):
+	"""Replace unstorable characters with U+FFFD in the text columns of report rows"""
+	return [{column: _UNSTORABLE_CHARS.sub('\ufffd', value) if isinstance(value, str) else value
+			 for column, value in row.items()} for row in rows]
+
+def export_qa_report(report_list, conflicts=None, output_file=DEFAULT_REPORT_FILE):
+	"""Write the issues (and consistency conflicts) to an Excel report
+
+	Returns:
+		Path of the report, or None when there are no issues
+	"""
+	import pandas as pd  # Imported here so JSON-lines runs don't need pandas/openpyxl
+
+	if not report_list:
+		return None
+	with pd.ExcelWriter(output_file) as writer:
+		pd.DataFrame(_storable(report_list)).to_excel(writer, index=False, sheet_name='QA Issues')
+		if conflicts:
+			pd.DataFrame(_storable(conflicts)).to_excel(writer, index=False, sheet_name='Consistency')
+	return output_file
+
+def run_qa_audit(source_file, target_file, store=None, run_id=None, workers=1, fingerprints=None,
+				 glossary=None, consistency=True, report_file=DEFAULT_REPORT_FILE):
+	"""Compare target strings against source strings and export flagged issues
+
+	Args:
+		source_file: Source language JSON
+		target_file: Target language JSON
+		store: Optional ResultStore; issues are also written to its qa_issues table
+		run_id: Run partition for the store (default: current timestamp)
+		workers: Worker processes for the checks (1 to audit serially, None for CPU count)
+		fingerprints: Optional QAFingerprintStore; only keys changed since the last
+			audit of this target are re-checked
+		glossary: Optional Glossary (see glossary_checker.load_glossary) for terminology checks
+		consistency: Run the cross-string consistency checks; conflicting keys are listed
+			on the report's Consistency sheet
+		report_file: Excel report path (None to skip the report)
+
+	Returns:
+		List of issue dicts (Key, Issue, Severity, Source, Target)
+	"""
+	#Load the JSON data
+	source_data = load_strings(source_file)
+	target_data = load_strings(target_file)
+	language = locale_from_filename(target_file)
+
+	if fingerprints is not None:
+		report_list, rechecked = audit_strings_incremental(source_data, target_data, fingerprints,
+														   os.path.basename(target_file), workers, glossary, language)
+		print(f"Re-checked {rechecked:,} of {len(source_data):,} keys (others unchanged since the last audit).")
 	else:
+		report_list = audit_strings_parallel(source_data, target_data, workers, glossary=glossary,
+											 language=language)
+
+	# Table-wide checks always cover every key, including incremental runs
+	conflicts = []
+	if consistency:
+		consistency_issues, conflicts = check_consistency(source_data, target_data)
+		report_list.extend(consistency_issues)
+
+	if store is not None:
+		from result_store import new_run_id  # Imported here so store-less audits don't need pandas
+		run_id = run_id or new_run_id()
+		store.write_qa_issues(_storable(report_list), run_id, locale=os.path.basename(target_file))
+
+	if not report_list:
 		print("No issues found!")
+	elif report_file:
+		export_qa_report(report_list, conflicts, report_file)
+		print(f"Report generated with {len(report_list)} issues.")
+	else:
+		print(f"Found {len(report_list)} issues.")
+	return report_list
+
+def _exit_code(severity_counts, fail_on):
+	"""Exit code of the most severe issue at or above fail_on ('none' never fails)"""
+	if fail_on == 'none':
+		return 0
+	severities = list(SEVERITY_EXIT_CODES)
+	failing = [severity for severity in severities[severities.index(fail_on):] if severity_counts[severity]]
+	return SEVERITY_EXIT_CODES[failing[-1]] if failing else 0
+
+def _audit_json_files(args, glossary, emit):
+	"""Audit a source/target JSON pair for the CLI, emitting issues as they are found"""
+	try:
+		source_data = load_strings(args.source)
+		target_data = load_strings(args.target)
+	except INPUT_ERRORS as e:
+		raise InputError(f"{type(e).__name__}: {e}") from e
+	language = locale_from_filename(args.target)
+	summary = {"keys": len(source_data)}
+
+	if args.fingerprints:
+		with QAFingerprintStore(args.fingerprints) as fingerprints:
+			issues, summary["rechecked"] = audit_strings_incremental(
+				source_data, target_data, fingerprints, os.path.basename(args.target),
+				args.workers, glossary, language)
+	elif args.workers != 1:
+		issues = audit_strings_parallel(source_data, target_data, args.workers, glossary=glossary,
+										language=language)
+	else:
+		issues = iter_issues(source_data, target_data, glossary, language)
+	for issue in issues:
+		emit(issue)
+
+	conflicts = []
+	if not args.no_consistency:
+		consistency_issues, conflicts = check_consistency(source_data, target_data)
+		for issue in consistency_issues:
+			emit(issue)
+	return summary, conflicts
+
+def _audit_workbook_file(args, glossary, emit):
+	"""Audit an Excel string table for the CLI; --excel writes the highlighted copy"""
+	from excel_qa import audit_workbook  # Imported here so JSON audits don't need openpyxl
+
+	columns = args.columns.split(',') if args.columns else None
+	output_file = args.excel if isinstance(args.excel, str) else None
+	# Issues arrive row by row, so a flagged row is counted when the row changes
+	flagged = {"rows": 0, "last": None}
+
+	def emit_row_issue(issue):
+		row = (issue['Key'], issue['Row'])
+		if row != flagged["last"]:
+			flagged["rows"] += 1
+			flagged["last"] = row
+		emit(issue)
+
+	# Progress messages go to stderr, so stdout stays JSON lines. Rows are parsed while
+	# they are checked, so InputError can surface mid-audit; check and save errors are
+	# not input errors and propagate as they are.
+	with redirect_stdout(sys.stderr):
+		_, highlighted = audit_workbook(args.source, columns, glossary, output_file,
+										highlight=bool(args.excel), emit=emit_row_issue)
+	return {"rows_flagged": flagged["rows"], "report": highlighted}, []
+
+def main(argv=None):
+	"""Command-line entry point; returns the exit code"""
+	parser = argparse.ArgumentParser(description="Localization QA auditor (JSON-lines output)")
+	parser.add_argument('source', help="Source JSON, or an Excel string table")
+	parser.add_argument('target', nargs='?', help="Target JSON (not used for Excel string tables)")
+	parser.add_argument('--columns', help="Excel target columns, comma-separated (default: EN,JP)")
+	parser.add_argument('--glossary', help="Glossary CSV/JSON for terminology checks")
+	parser.add_argument('--fingerprints', help="Fingerprint DB; only re-check keys changed since the last run")
+	parser.add_argument('--workers', type=int, default=1, help="Worker processes (0: CPU count)")
+	parser.add_argument('--no-consistency', action='store_true', help="Skip cross-string consistency checks")
+	parser.add_argument('--excel', nargs='?', const=True, default=False,
+						help=f"Also write an Excel report (default: {DEFAULT_REPORT_FILE}, or <table>_QA.xlsx)")
+	parser.add_argument('--fail-on', choices=list(SEVERITY_EXIT_CODES) + ['none'], default='High',
+						help="Lowest severity that makes the run fail (default: High)")
+	args = parser.parse_args(argv)
+
+	is_workbook = args.source.lower().endswith(('.xlsx', '.xlsm'))
+	if not is_workbook and not args.target:
+		parser.error("a target JSON is required unless the source is an Excel string table")
+	args.workers = args.workers or None
+
+	started = time.perf_counter()
+	severity_counts = Counter()
+	# Excel tables get a highlighted copy instead of a report built from every issue
+	report_list = [] if args.excel and not is_workbook else None
+	stdout = sys.stdout
+
+	def emit(issue):
+		severity_counts[issue['Severity']] += 1
+		if report_list is not None:
+			report_list.append(issue)
+		# Bound before the workbook audit redirects sys.stdout to stderr
+		stdout.write(json.dumps(_storable([issue])[0], ensure_ascii=False) + '\n')
+
+	try:
+		glossary = None
+		if args.glossary:
+			from glossary_checker import load_glossary
+			try:
+				glossary = load_glossary(args.glossary)
+			except INPUT_ERRORS as e:
+				raise InputError(f"{type(e).__name__}: {e}") from e
+		if is_workbook:
+			summary, conflicts = _audit_workbook_file(args, glossary, emit)
+		else:
+			summary, conflicts = _audit_json_files(args, glossary, emit)
+	except InputError as e:
+		# Unreadable input must not exit 1 and read as a Warning result; other
+		# exceptions are bugs and keep their traceback
+		print(f" X Error reading input: {e}", file=sys.stderr)
+		return EXIT_INPUT_ERROR
+	# Failing to write the report is an output error, not unreadable input
+	if args.excel and not is_workbook:
+		summary["report"] = export_qa_report(
+			report_list, conflicts, args.excel if isinstance(args.excel, str) else DEFAULT_REPORT_FILE)
+	sys.stdout.flush()
+
+	exit_code = _exit_code(severity_counts, args.fail_on)
+	summary.update({
+		"issues": sum(severity_counts.values()),
+		"severity": {severity: severity_counts[severity] for severity in reversed(list(SEVERITY_EXIT_CODES))},
+		"seconds": round(time.perf_counter() - started, 3),
+		"exit_code": exit_code,
+	})
+	print(json.dumps({"summary": summary}, ensure_ascii=False), file=sys.stderr)
+	return exit_code
 
-run_qa_audit('qa_en-US.json', 'qa_ko-KR.json')
\ No newline at end of file
+if __name__ == '__main__':
+	sys.exit(main())
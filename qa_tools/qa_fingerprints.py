@@ -0,0 +1,91 @@
+"""
+Per-key fingerprint store for incremental QA audits
+
+Each audited key keeps a fingerprint of its source text, target text and the QA
+ruleset version, together with the issues it had. On the next audit only keys
+whose fingerprint changed are re-checked; the rest carry their issues forward.
+The store is an on-disk SQLite file, one row per (locale, key).
+"""
+
+import json
+import hashlib
+import sqlite3
+
+DEFAULT_FINGERPRINT_PATH = 'qa_fingerprints.db'
+
+# Stands in for a target that is missing, so it fingerprints differently from ""
+_MISSING = b'\x01'
+
+
+def string_fingerprint(source_text, target_text, ruleset_version):
+	"""Hash of a source/target pair under a ruleset version (target_text None if missing)"""
+	digest = hashlib.blake2b(digest_size=16)
+	digest.update(str(ruleset_version).encode('utf-8'))
+	digest.update(b'\x00')
+	digest.update(source_text.encode('utf-8', 'surrogatepass'))
+	digest.update(b'\x00')
+	digest.update(_MISSING if target_text is None else target_text.encode('utf-8', 'surrogatepass'))
+	return digest.digest()
+
+
+class QAFingerprintStore:
+	"""On-disk fingerprints and carried-forward issues of previously audited keys"""
+
+	def __init__(self, db_path=DEFAULT_FINGERPRINT_PATH):
+		"""
+		Args:
+			db_path: SQLite file holding the fingerprints (created if missing)
+		"""
+		self.db_path = db_path
+		self.conn = sqlite3.connect(db_path)
+		self.conn.executescript("""
+			CREATE TABLE IF NOT EXISTS fingerprints (
+				locale TEXT NOT NULL,
+				key TEXT NOT NULL,
+				fingerprint BLOB NOT NULL,
+				issues TEXT NOT NULL,
+				PRIMARY KEY (locale, key)
+			);
+		""")
+
+	def close(self):
+		self.conn.close()
+
+	def __enter__(self):
+		return self
+
+	def __exit__(self, *exc):
+		self.close()
+
+	def __len__(self):
+		return self.conn.execute("SELECT COUNT(*) FROM fingerprints").fetchone()[0]
+
+	def load(self, locale):
+		"""Return {key: (fingerprint, [(issue, severity), ...])} for a locale"""
+		rows = self.conn.execute("SELECT key, fingerprint, issues FROM fingerprints WHERE locale = ?", (locale,))
+		return {key: (fingerprint, [tuple(issue) for issue in json.loads(issues)])
+				for key, fingerprint, issues in rows}
+
+	def update(self, locale, changed, removed=()):
+		"""Save re-checked keys and drop keys that no longer exist
+
+		Args:
+			locale: Target locale (or target file name)
+			changed: Iterable of (key, fingerprint, [(issue, severity), ...])
+			removed: Keys to delete
+		"""
+		self.conn.executemany(
+			"INSERT OR REPLACE INTO fingerprints (locale, key, fingerprint, issues) VALUES (?, ?, ?, ?)",
+			((locale, key, fingerprint, json.dumps(issues, ensure_ascii=False))
+			 for key, fingerprint, issues in changed))
+		self.conn.executemany("DELETE FROM fingerprints WHERE locale = ? AND key = ?",
+							  ((locale, key) for key in removed))
+		self.conn.commit()
+
+	def clear(self, locale=None):
+		"""Forget one locale (or every locale), so the next audit re-checks all keys"""
+		if locale is None:
+			self.conn.execute("DELETE FROM fingerprints")
+		else:
+			self.conn.execute("DELETE FROM fingerprints WHERE locale = ?", (locale,))
+		self.conn.commit()
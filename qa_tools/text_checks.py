@@ -0,0 +1,184 @@
+"""
+Script and encoding checks for translated strings
+
+- Leftover source script: characters of a script the target language does not use,
+  copied over from the source (Hangul left in an English string). Scripts are
+  defined by a codepoint range table, compiled into one character class per target
+  language, so a clean string costs a single regex scan.
+- Mojibake: UTF-8 text that was decoded as Windows-1252/Latin-1 ("ì•ˆë…•"), or
+  U+FFFD replacement characters.
+- Invalid UTF-8: bytes that did not decode (kept as lone surrogates when the file
+  is read with errors='surrogateescape').
+- Control characters other than tab and line breaks.
+"""
+
+import re
+import os
+from bisect import bisect_right
+from functools import lru_cache
+
+# Non-Latin scripts as codepoint ranges; Latin, digits and punctuation are allowed
+# in every language (brand names, "50GB")
+SCRIPT_RANGES = {
+	'Hangul': [(0x1100, 0x11FF), (0x3130, 0x318F), (0xA960, 0xA97F), (0xAC00, 0xD7AF), (0xD7B0, 0xD7FF)],
+	'Kana': [(0x3040, 0x309F), (0x30A0, 0x30FF), (0x31F0, 0x31FF), (0xFF66, 0xFF9F)],
+	'Han': [(0x3400, 0x4DBF), (0x4E00, 0x9FFF), (0xF900, 0xFAFF), (0x20000, 0x2FA1F)],
+	'Cyrillic': [(0x0400, 0x04FF), (0x0500, 0x052F)],
+	'Greek': [(0x0370, 0x03FF)],
+	'Arabic': [(0x0600, 0x06FF), (0x0750, 0x077F)],
+	'Hebrew': [(0x0590, 0x05FF)],
+	'Thai': [(0x0E00, 0x0E7F)],
+	'Devanagari': [(0x0900, 0x097F)],
+}
+
+# Scripts each target language is written in (languages not listed use Latin only)
+LOCALE_SCRIPTS = {
+	'ko': ('Hangul', 'Han'),
+	'ja': ('Kana', 'Han'),
+	'zh': ('Han',),
+	'ru': ('Cyrillic',),
+	'uk': ('Cyrillic',),
+	'bg': ('Cyrillic',),
+	'sr': ('Cyrillic',),
+	'el': ('Greek',),
+	'ar': ('Arabic',),
+	'fa': ('Arabic',),
+	'ur': ('Arabic',),
+	'he': ('Hebrew',),
+	'th': ('Thai',),
+	'hi': ('Devanagari',),
+}
+
+# Sorted range starts for mapping a character back to its script
+_RANGE_TABLE = sorted((start, end, script) for script, ranges in SCRIPT_RANGES.items()
+					  for start, end in ranges)
+_RANGE_STARTS = [start for start, _, _ in _RANGE_TABLE]
+
+# Locale at the end of a file name: ko-KR.json, strings_ja.json, zh_Hans.json
+_LOCALE_PATTERN = re.compile(r'(?:^|[^A-Za-z])([a-z]{2,3})(?:[-_][A-Za-z]{2,4})?$')
+
+# Tab, line feed and carriage return are allowed
+_CONTROL_CHARS = re.compile('[\x00-\x08\x0b\x0c\x0e-\x1f\x7f]')
+_SURROGATES = re.compile('[\ud800-\udfff]')
+
+# A UTF-8 lead byte followed by continuation bytes, as they look when decoded as
+# Windows-1252 or Latin-1 ("Ã©", "ì•ˆ")
+_CONTINUATION_CHARS = ''.join(sorted(set(bytes(range(0x80, 0xC0)).decode('cp1252', 'ignore'))
+									 | set(map(chr, range(0x80, 0xA0)))))
+_MOJIBAKE_RUN = re.compile('[Â-ô][' + re.escape(_CONTINUATION_CHARS) + ']{1,3}')
+
+# Besides SCRIPT_RANGES, characters a mis-decoded 3-4 byte sequence plausibly was:
+# general punctuation and currency (’ “ € ‰), CJK/fullwidth punctuation, emoji
+_PLAUSIBLE_RANGES = [(0x2000, 0x20CF), (0x2100, 0x218F), (0x3000, 0x303F), (0xFF00, 0xFFEF),
+					 (0x1F000, 0x1FAFF)]
+
+
+def locale_from_filename(path):
+	"""Return the language code of a file named after its locale (qa_ko-KR.json -> 'ko'), or None"""
+	stem = os.path.splitext(os.path.basename(path))[0]
+	match = _LOCALE_PATTERN.search(stem)
+	return match.group(1) if match else None
+
+
+@lru_cache(maxsize=None)
+def _foreign_pattern(language):
+	"""Character class of every table script the language does not use"""
+	allowed = LOCALE_SCRIPTS.get(language, ())
+	ranges = [f'{chr(start)}-{chr(end)}' for script, script_ranges in SCRIPT_RANGES.items()
+			  if script not in allowed for start, end in script_ranges]
+	return re.compile('[' + ''.join(ranges) + ']')
+
+
+def script_of(char):
+	"""Return the SCRIPT_RANGES script of a character, or None"""
+	index = bisect_right(_RANGE_STARTS, ord(char)) - 1
+	if index >= 0:
+		start, end, script = _RANGE_TABLE[index]
+		if start <= ord(char) <= end:
+			return script
+	return None
+
+
+def leftover_scripts(source_text, target_text, language):
+	"""Scripts of the source found in a target whose language does not use them"""
+	foreign = set(_foreign_pattern(language).findall(target_text))
+	if not foreign:
+		return []
+	target_scripts = {script_of(char) for char in foreign}
+	source_scripts = {script_of(char) for char in set(_foreign_pattern(language).findall(source_text))}
+	return sorted(target_scripts & source_scripts)
+
+
+def _decode_sequence(run):
+	"""Decode a run as one UTF-8 sequence of Windows-1252/Latin-1 bytes, or None"""
+	lead = ord(run[0])
+	length = 2 if lead < 0xE0 else 3 if lead < 0xF0 else 4
+	if len(run) < length:
+		return None
+	for encoding in ('cp1252', 'latin-1'):
+		try:
+			return run[:length].encode(encoding).decode('utf-8')
+		except UnicodeError:
+			continue
+	return None
+
+
+def _is_plausible(char):
+	"""True if a character decoded from a 3-4 byte sequence is likely real text"""
+	code = ord(char)
+	return (code > 0x7FF and script_of(char) is not None
+			or any(start <= code <= end for start, end in _PLAUSIBLE_RANGES))
+
+
+def is_mojibake(text):
+	"""True if the text holds U+FFFD or UTF-8 sequences that were decoded as Windows-1252/Latin-1
+
+	Normal accented text can also be valid UTF-8 when read as bytes: "É…" and "ß“"
+	decode to 2-byte sequences, "à\u00a0«" to a 3-byte one (U+082B). Such sequences
+	only count when a string has several of them (Cyrillic/Greek mojibake). Â/Ã
+	sequences (mis-decoded Latin-1, "Ã©") and 3-4 byte sequences that decode to a
+	known script, punctuation or emoji ("ì•ˆ", "â€™") count alone.
+
+	>>> is_mojibake('CafÃ©'), is_mojibake('ì•ˆë…•'), is_mojibake('ÐŸÑ€Ð¸Ð²ÐµÑ‚'), is_mojibake('Itâ€™s')
+	(True, True, True, True)
+	>>> is_mojibake('„Gruß“'), is_mojibake('CAFÉ…'), is_mojibake('RÉSUMÉ…')
+	(False, False, False)
+	>>> is_mojibake('Voilà\u00a0« OK »'), is_mojibake('Déjà\u00a0»')
+	(False, False)
+	"""
+	if '�' in text:
+		return True
+	weak = 0
+	for match in _MOJIBAKE_RUN.finditer(text):
+		run = match.group()
+		char = _decode_sequence(run)
+		if char is None:
+			continue
+		if ord(run[0]) <= 0xC3 or _is_plausible(char):
+			return True
+		weak += 1
+		if weak > 1:
+			return True
+	return False
+
+
+def check_text(source_text, target_text, language=None):
+	"""Script and encoding checks for one translated string
+
+	Args:
+		language: Target language code (see locale_from_filename); None means Latin only
+
+	Returns:
+		List of (issue, severity)
+	"""
+	issues = []
+	if _SURROGATES.search(target_text):
+		issues.append(("Invalid UTF-8", "CRITICAL"))
+	if _CONTROL_CHARS.search(target_text):
+		issues.append(("Control Character", "High"))
+	if is_mojibake(target_text):
+		issues.append(("Mojibake", "High"))
+	scripts = leftover_scripts(source_text, target_text, language)
+	if scripts:
+		issues.append((f"Leftover Source Script: {', '.join(scripts)}", "High"))
+	return issues
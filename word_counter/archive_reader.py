@@ -0,0 +1,130 @@
+"""
+Read localization files straight out of zip/tar handoff packages
+
+Members are parsed from in-archive streams, never extracted to disk. Results are
+reported under archive-qualified names like 'handoff.zip!/ui/strings.json'.
+
+- zip: each worker process opens the archive once and seeks to its members
+- tar (.tar, .tar.gz, .tgz, .tar.bz2, .tar.xz): compressed tars can only be read
+  front to back, so members are read in order and their bytes handed to workers
+"""
+
+import io
+import tarfile
+import zipfile
+from segments import get_reader, iter_xliff_segment_states
+
+ARCHIVE_SUFFIXES = ('.zip', '.tar', '.tar.gz', '.tgz', '.tar.bz2', '.tbz2', '.tar.xz', '.txz')
+ARCHIVE_PATTERNS = ['*' + suffix for suffix in ARCHIVE_SUFFIXES]
+
+# Separator between the archive path and the member path in reported names
+MEMBER_SEPARATOR = '!/'
+
+# Zip archives opened by this process, by path. Opening a ZipFile parses the whole
+# central directory, so opening it per member is quadratic in the member count.
+_open_zips = {}
+
+
+def is_archive(path):
+	return path.lower().endswith(ARCHIVE_SUFFIXES)
+
+
+def qualified_name(archive_name, member_name):
+	return f"{archive_name}{MEMBER_SEPARATOR}{member_name}"
+
+
+def iter_archive_members(archive_path):
+	"""Yield (member name, open binary stream) for every supported member, in archive order
+
+	Streams are only valid until the next member is requested.
+	"""
+	if archive_path.lower().endswith('.zip'):
+		with zipfile.ZipFile(archive_path) as zf:
+			for info in zf.infolist():
+				if info.is_dir() or get_reader(info.filename) is None:
+					continue
+				with zf.open(info) as stream:
+					yield info.filename, stream
+		return
+
+	# Stream mode: one sequential pass, works for compressed tars
+	with tarfile.open(archive_path, mode='r|*') as tf:
+		for info in tf:
+			if not info.isfile() or get_reader(info.name) is None:
+				continue
+			yield info.name, tf.extractfile(info)
+
+
+def list_zip_members(archive_path):
+	"""Return names of the supported members of a zip archive"""
+	with zipfile.ZipFile(archive_path) as zf:
+		return [info.filename for info in zf.infolist()
+				if not info.is_dir() and get_reader(info.filename) is not None]
+
+
+def _zip_file(archive_path):
+	"""Return this process's open ZipFile for an archive, opening it on first use
+
+	Archives are read one after another, so opening a new one closes the previous
+	one; worker processes shared across archives keep one handle each.
+	"""
+	zf = _open_zips.get(archive_path)
+	if zf is None:
+		for other in list(_open_zips):
+			close_zip_file(other)
+		zf = _open_zips[archive_path] = zipfile.ZipFile(archive_path)
+	return zf
+
+
+def close_zip_file(archive_path):
+	"""Close this process's cached ZipFile for an archive, if any"""
+	zf = _open_zips.pop(archive_path, None)
+	if zf is not None:
+		zf.close()
+
+
+def is_xliff(name):
+	return name.lower().endswith(('.xlf', '.xliff'))
+
+
+def extract_member_segments(archive_path, member_name, data=None, progress=False):
+	"""Parse one archive member into a list of segments (worker entry point)
+
+	Args:
+		archive_path: Archive the member belongs to
+		member_name: Path of the member inside the archive
+		data: Member bytes (tar); if None the member is read from this process's open zip
+		progress: For XLIFF members, return (Segment, state) pairs instead of segments
+
+	Returns:
+		(file type, list of Segment or (Segment, state)) or (file type, error message string)
+	"""
+	file_type, iter_file_segments = get_reader(member_name)
+	try:
+		if data is None:
+			with _zip_file(archive_path).open(member_name) as member:
+				# python-docx and PyPDF2 need a seekable stream
+				stream = io.BytesIO(member.read())
+		else:
+			stream = io.BytesIO(data)
+		stream.name = member_name
+		if progress and is_xliff(member_name):
+			return file_type, list(iter_xliff_segment_states(stream))
+		return file_type, list(iter_file_segments(stream))
+	except Exception as e:
+		return file_type, str(e)
+
+
+def iter_archive_jobs(archive_path):
+	"""Yield (member name, bytes or None) for each supported member
+
+	Zip members are yielded without data (workers open them); tar member bytes are
+	read here, in one sequential pass.
+	"""
+	if archive_path.lower().endswith('.zip'):
+		for member_name in list_zip_members(archive_path):
+			yield member_name, None
+		return
+
+	for member_name, stream in iter_archive_members(archive_path):
+		yield member_name, stream.read()
@@ -0,0 +1,180 @@
+"""
+Vectorized multi-language cost engine
+
+Costs are computed for the full file x language x match band matrix in one NumPy
+broadcast:
+	cost[f, l, b] = band_words[f, b] * band_weight[b] * file_type_multiplier[f] * rate[l]
+
+Rates load from an external JSON (see rates.json) or CSV file. Changing rates only
+re-runs the final product, so what-if recalculation is cheap.
+"""
+
+import os
+import json
+import numpy as np
+import pandas as pd
+from repetition_analyzer import MATCH_BANDS, MATCH_BAND_WEIGHTS
+
+DEFAULT_RATES_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'rates.json')
+
+
+def load_rate_table(path=DEFAULT_RATES_FILE):
+	"""Load a rate table from JSON or CSV (path may be a str or os.PathLike)
+
+	JSON: {"languages": {name: rate}, "file_type_multipliers": {...}, "band_weights": {...}}
+	CSV: one row per language with 'language' and 'rate' columns
+
+	Returns:
+		Dict with 'currency', 'languages', 'file_type_multipliers' and 'band_weights'
+	"""
+	if os.fspath(path).lower().endswith('.csv'):
+		df = pd.read_csv(path)
+		table = {'languages': dict(zip(df['language'], df['rate'].astype(float)))}
+	else:
+		with open(path, 'r', encoding='utf-8') as f:
+			table = json.load(f)
+
+	return {
+		'currency': table.get('currency', 'USD'),
+		'languages': table['languages'],
+		'file_type_multipliers': table.get('file_type_multipliers', {}),
+		'band_weights': {**MATCH_BAND_WEIGHTS, **table.get('band_weights', {})},
+	}
+
+
+def flat_rate_table(cost_per_word, base=None):
+	"""Rate table that prices every word at one flat rate, for the old cost_per_word arguments
+
+	Band weights and file type multipliers are kept from base (default: rates.json).
+	"""
+	base = base or load_rate_table()
+	return {**base, 'languages': {'Flat rate': float(cost_per_word)}}
+
+
+def format_cost(amount, currency='USD', decimals=2):
+	"""Format an amount in the rate table's currency ($1,234.50 or 1,234.50 EUR)"""
+	if currency == 'USD':
+		return f"${amount:,.{decimals}f}"
+	return f"{amount:,.{decimals}f} {currency}"
+
+
+def _band_words(result):
+	"""Return a result's words per band, in MATCH_BANDS order
+
+	Accepts both result['bands'] (multi_format_counter) and flat band columns
+	(streamlit_advanced_counter); files without match analysis are all 'No Match'.
+	When XLIFF progress states are known, only the untranslated (New) share is kept.
+	"""
+	if 'bands' in result:
+		words = [result['bands'].get(band, 0) for band in MATCH_BANDS]
+	elif all(band in result for band in MATCH_BANDS):
+		words = [result[band] for band in MATCH_BANDS]
+	else:
+		words = [0] * (len(MATCH_BANDS) - 1) + [result['words']]
+	if result.get('states') and result['words']:
+		share = result['states']['New'] / result['words']
+		words = [band_words * share for band_words in words]
+	return words
+
+
+class CostEngine:
+	"""File x language x band cost matrix for a set of counter results"""
+
+	def __init__(self, file_results, rate_table):
+		"""
+		Args:
+			file_results: List of result dicts from count_words_in_file
+			rate_table: Dict from load_rate_table
+		"""
+		self.filenames = [result['filename'] for result in file_results]
+		self.words = np.array([result['words'] for result in file_results], dtype=np.float64)
+		self.file_types = [result['file_type'] for result in file_results]
+		self.band_words = np.array([_band_words(result) for result in file_results],
+								   dtype=np.float64).reshape(len(file_results), len(MATCH_BANDS))
+		self.currency = rate_table.get('currency', 'USD')
+		self.rate_column = f'Rate ({self.currency}/word)'
+		self.cost_column = f'Total Cost ({self.currency})'
+
+		self.band_weights = np.array([MATCH_BAND_WEIGHTS[band] for band in MATCH_BANDS])
+		self.type_multipliers = np.ones(len(self.file_types))
+		self.weighted_words = self.band_words @ self.band_weights
+		self.set_rates(rate_table['languages'],
+					   rate_table.get('band_weights'),
+					   rate_table.get('file_type_multipliers'))
+
+	def set_rates(self, language_rates=None, band_weights=None, file_type_multipliers=None):
+		"""Update any part of the rate table; parts left as None keep their current values"""
+		if band_weights is not None:
+			self.band_weights = np.array([band_weights.get(band, 1.0) for band in MATCH_BANDS])
+		if file_type_multipliers is not None:
+			self.type_multipliers = np.array([file_type_multipliers.get(file_type, 1.0)
+											  for file_type in self.file_types])
+
+		# Billable words per file: the only part that depends on bands and file types
+		if band_weights is not None or file_type_multipliers is not None:
+			self.weighted_words = (self.band_words @ self.band_weights) * self.type_multipliers
+
+		if language_rates is not None:
+			self.languages = list(language_rates)
+			self.rates = np.array([language_rates[lang] for lang in self.languages], dtype=np.float64)
+
+	def _language_index(self, languages):
+		if languages is None:
+			return np.arange(len(self.languages))
+		return np.array([self.languages.index(lang) for lang in languages], dtype=np.int64)
+
+	def cost_matrix(self, languages=None):
+		"""Return the full file x language x band cost array"""
+		rates = self.rates[self._language_index(languages)]
+		return (self.band_words[:, None, :]
+				* self.band_weights[None, None, :]
+				* self.type_multipliers[:, None, None]
+				* rates[None, :, None])
+
+	def _language_frame(self, index, rates):
+		# Source Words are raw counts; costs are priced on the band-weighted Billable Words
+		billable_words = self.weighted_words.sum()
+		return pd.DataFrame({
+			'Target Language': [self.languages[i] for i in index],
+			self.rate_column: rates,
+			'Source Words': self.words.sum(),
+			'Billable Words': round(billable_words, 1),
+			self.cost_column: (billable_words * rates).round(2),
+		})
+
+	def costs_by_language(self, languages=None):
+		"""DataFrame with one row per target language"""
+		index = self._language_index(languages)
+		return self._language_frame(index, self.rates[index])
+
+	def costs_by_file(self, languages=None):
+		"""DataFrame of files x target languages"""
+		index = self._language_index(languages)
+		costs = np.outer(self.weighted_words, self.rates[index]).round(2)
+		df = pd.DataFrame(costs, columns=[self.languages[i] for i in index])
+		df.insert(0, 'Weighted Words', self.weighted_words.round(1))
+		df.insert(0, 'Type', self.file_types)
+		df.insert(0, 'File Name', self.filenames)
+		return df
+
+	def costs_by_band(self, languages=None):
+		"""DataFrame of match bands x target languages"""
+		matrix = self.cost_matrix(languages).sum(axis=0).T.round(2)
+		index = self._language_index(languages)
+		df = pd.DataFrame(matrix, columns=[self.languages[i] for i in index])
+		df.insert(0, 'Words', self.band_words.sum(axis=0))
+		df.insert(0, 'Match Band', MATCH_BANDS)
+		return df
+
+	def total_cost(self, languages=None):
+		return float(self.weighted_words.sum() * self.rates[self._language_index(languages)].sum())
+
+	def what_if(self, language_rates, languages=None):
+		"""Costs by language under alternative rates, without changing the engine
+
+		Args:
+			language_rates: Dict of {language: rate}; languages not listed keep their rate
+		"""
+		index = self._language_index(languages)
+		rates = np.array([language_rates.get(self.languages[i], self.rates[i]) for i in index])
+		return self._language_frame(index, rates)
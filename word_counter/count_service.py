@@ -0,0 +1,355 @@
+"""
+Local count/QA service with a bounded job queue
+
+Runs a small HTTP/JSON server that processes jobs on a shared pool of worker
+processes, so several front-ends (GUI, Streamlit) can submit work and poll for
+results instead of parsing in their own UI thread. Parsing is CPU-bound Python,
+so jobs run in processes to execute in parallel rather than take turns on the GIL.
+
+Endpoints:
+	POST /jobs               submit a job, returns {"id": ..., "status": "queued"}
+	                         (503 when the queue is full)
+	GET  /jobs/<id>          status and progress
+	GET  /jobs/<id>/result   results once the job is done
+	GET  /health             queue and worker statistics
+
+Job payloads:
+	{"type": "count", "paths": ["file.json", "folder/"], "repetitions": true, "strip_tags": true}
+	{"type": "count", "files": [{"name": "ui.json", "content": "<base64>"}]}
+	{"type": "qa", "source": "en-US.json", "target": "ko-KR.json", "consistency": true}
+
+Usage:
+	python count_service.py [port] [workers]
+"""
+
+import os
+import io
+import sys
+import json
+import time
+import uuid
+import queue
+import base64
+import threading
+import multiprocessing
+import urllib.request
+import urllib.error
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from file_walker import walk_files
+from segments import SUPPORTED_PATTERNS
+from archive_reader import ARCHIVE_PATTERNS, is_archive
+from repetition_analyzer import RepetitionAnalyzer
+from multi_format_counter import count_words_in_file, count_words_in_stream, count_words_in_archive
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'qa_tools'))
+from qa_auditor import run_qa_audit, _storable
+
+DEFAULT_PORT = 8765
+DEFAULT_SERVICE_URL = f"http://127.0.0.1:{DEFAULT_PORT}"
+
+
+class JobManager:
+	"""Bounded job queue processed by a pool of worker processes
+
+	One dispatcher thread per worker process takes jobs off the queue, runs them on
+	the process pool and records their status; job progress is shared with the
+	worker processes through a multiprocessing manager dict.
+	"""
+
+	def __init__(self, workers=4, max_queued=100, max_finished=1000):
+		"""
+		Args:
+			workers: Number of worker processes
+			max_queued: Maximum number of jobs waiting in the queue
+			max_finished: Number of finished jobs kept for polling before eviction
+		"""
+		self.queue = queue.Queue(maxsize=max_queued)
+		self.jobs = OrderedDict()
+		self.lock = threading.Lock()
+		self.max_finished = max_finished
+		# Workers start lazily from the dispatcher threads while the HTTP server threads
+		# run; forking a multi-threaded process can deadlock, so they are spawned
+		context = multiprocessing.get_context('spawn')
+		self.pool = ProcessPoolExecutor(max_workers=workers, mp_context=context)
+		self.shared = context.Manager()
+		# job id -> progress dict proxy, while the job runs
+		self.progress = {}
+		self.workers = [threading.Thread(target=self._worker, daemon=True) for _ in range(workers)]
+		for worker in self.workers:
+			worker.start()
+
+	def close(self):
+		self.pool.shutdown(wait=False, cancel_futures=True)
+		self.shared.shutdown()
+
+	def submit(self, payload):
+		"""Queue a job; raises ValueError for bad payloads and queue.Full when busy"""
+		if not isinstance(payload, dict):
+			raise ValueError("Job payload must be a JSON object")
+		job_type = payload.get('type')
+		if job_type not in JOB_RUNNERS:
+			raise ValueError(f"Unknown job type: {job_type!r}")
+
+		job = {
+			'id': uuid.uuid4().hex,
+			'type': job_type,
+			'status': 'queued',
+			'progress': {'done': 0, 'total': None},
+			'submitted': time.time(),
+			'started': None,
+			'finished': None,
+			'error': None,
+			'result': None,
+		}
+		with self.lock:
+			self.jobs[job['id']] = job
+		try:
+			self.queue.put_nowait((job, payload))
+		except queue.Full:
+			with self.lock:
+				del self.jobs[job['id']]
+			raise
+		return job
+
+	def get(self, job_id):
+		with self.lock:
+			job = self.jobs.get(job_id)
+			progress = self.progress.get(job_id)
+		if job is not None and progress is not None:
+			job['progress'] = dict(progress)
+		return job
+
+	def stats(self):
+		with self.lock:
+			statuses = [job['status'] for job in self.jobs.values()]
+		return {
+			'workers': len(self.workers),
+			'queued': self.queue.qsize(),
+			'running': statuses.count('running'),
+			'done': statuses.count('done'),
+			'failed': statuses.count('failed'),
+		}
+
+	def _evict_finished(self):
+		finished = [job_id for job_id, job in self.jobs.items() if job['status'] in ('done', 'failed')]
+		for job_id in finished[:max(0, len(finished) - self.max_finished)]:
+			del self.jobs[job_id]
+
+	def _worker(self):
+		while True:
+			job, payload = self.queue.get()
+			progress = self.shared.dict(job['progress'])
+			with self.lock:
+				self.progress[job['id']] = progress
+			job['status'] = 'running'
+			job['started'] = time.time()
+			try:
+				job['result'] = self.pool.submit(JOB_RUNNERS[job['type']], payload, progress).result()
+				job['status'] = 'done'
+			except Exception as e:
+				job['error'] = str(e)
+				job['status'] = 'failed'
+			job['progress'] = dict(progress)
+			job['finished'] = time.time()
+			with self.lock:
+				del self.progress[job['id']]
+				self._evict_finished()
+			self.queue.task_done()
+
+
+def run_count_job(payload, progress):
+	"""Count words in local paths and/or base64-encoded uploaded files (runs in a worker process)
+
+	Folders are walked like analyze_folder, including zip/tar handoff packages; their
+	files are reported relative to the folder.
+	"""
+	analyzer = RepetitionAnalyzer() if payload.get('repetitions') else None
+	strip_tags = bool(payload.get('strip_tags'))
+
+	# (path, reported name)
+	files = []
+	for path in payload.get('paths', []):
+		if os.path.isdir(path):
+			files.extend((filepath, os.path.relpath(filepath, path))
+						 for filepath in walk_files(path, include=SUPPORTED_PATTERNS + ARCHIVE_PATTERNS))
+		else:
+			files.append((path, os.path.basename(path)))
+	uploads = payload.get('files', [])
+	progress['total'] = len(files) + len(uploads)
+
+	results = []
+	errors = []
+	for filepath, name in files:
+		if is_archive(filepath):
+			# The job already runs in a worker process, so members are parsed inline
+			archive_results = count_words_in_archive(filepath, analyzer, strip_tags=strip_tags, workers=1, name=name)
+			if archive_results:
+				results.extend(archive_results)
+			else:
+				errors.append(name)
+		else:
+			result = count_words_in_file(filepath, analyzer, strip_tags=strip_tags, name=name)
+			if result:
+				results.append(result)
+			else:
+				errors.append(name)
+		progress['done'] += 1
+
+	for upload in uploads:
+		stream = io.BytesIO(base64.b64decode(upload['content']))
+		stream.name = upload['name']
+		try:
+			result = count_words_in_stream(stream, upload['name'], analyzer, strip_tags=strip_tags)
+		except Exception:
+			result = None
+		if result:
+			results.append(result)
+		else:
+			errors.append(upload['name'])
+		progress['done'] += 1
+
+	return {'results': results, 'errors': errors}
+
+
+def run_qa_job(payload, progress):
+	"""Run the QA checks for one source/target pair (runs in a worker process)
+
+	Uses the same audit as the QA CLI: the target language comes from the target
+	file name, and the cross-string consistency checks run unless disabled.
+	"""
+	progress['total'] = 1
+	issues = run_qa_audit(payload['source'], payload['target'], consistency=payload.get('consistency', True),
+						  report_file=None)
+	progress['done'] = 1
+	# Invalid UTF-8 in the input is kept as lone surrogates, which JSON responses cannot encode
+	return {'issues': _storable(issues)}
+
+
+JOB_RUNNERS = {
+	'count': run_count_job,
+	'qa': run_qa_job,
+}
+
+
+class ServiceHandler(BaseHTTPRequestHandler):
+	"""JSON endpoints over the server's JobManager"""
+
+	def _send(self, status, body):
+		data = json.dumps(body, ensure_ascii=False).encode('utf-8')
+		self.send_response(status)
+		self.send_header('Content-Type', 'application/json; charset=utf-8')
+		self.send_header('Content-Length', str(len(data)))
+		self.end_headers()
+		self.wfile.write(data)
+
+	def do_POST(self):
+		if self.path.rstrip('/') != '/jobs':
+			return self._send(404, {'error': 'Not found'})
+		try:
+			length = int(self.headers.get('Content-Length', 0))
+			payload = json.loads(self.rfile.read(length) or b'{}')
+			job = self.server.manager.submit(payload)
+		except (ValueError, KeyError) as e:
+			return self._send(400, {'error': str(e)})
+		except queue.Full:
+			return self._send(503, {'error': 'Job queue is full, try again later'})
+		self._send(202, {'id': job['id'], 'status': job['status']})
+
+	def do_GET(self):
+		parts = [part for part in self.path.split('/') if part]
+		manager = self.server.manager
+
+		if parts == ['health']:
+			return self._send(200, manager.stats())
+		if len(parts) in (2, 3) and parts[0] == 'jobs':
+			job = manager.get(parts[1])
+			if job is None:
+				return self._send(404, {'error': 'Unknown job'})
+			if len(parts) == 2:
+				return self._send(200, {key: value for key, value in job.items() if key != 'result'})
+			if parts[2] == 'result':
+				if job['status'] != 'done':
+					return self._send(409, {'error': f"Job is {job['status']}", 'status': job['status']})
+				return self._send(200, job['result'])
+		self._send(404, {'error': 'Not found'})
+
+	def log_message(self, format, *args):
+		# Keep the console for the counters' own progress output
+		pass
+
+
+def serve(port=DEFAULT_PORT, workers=4, max_queued=100):
+	"""Start the service and block until interrupted"""
+	server = ThreadingHTTPServer(('127.0.0.1', port), ServiceHandler)
+	server.manager = JobManager(workers=workers, max_queued=max_queued)
+	print(f"✓ Count service listening on http://127.0.0.1:{port} ({workers} workers)")
+	try:
+		server.serve_forever()
+	except KeyboardInterrupt:
+		pass
+	finally:
+		server.server_close()
+		server.manager.close()
+
+
+# Client helpers for the front-ends
+# ============================================================================
+
+def _request(url, payload=None, timeout=10):
+	data = None
+	headers = {}
+	if payload is not None:
+		data = json.dumps(payload).encode('utf-8')
+		headers['Content-Type'] = 'application/json'
+	request = urllib.request.Request(url, data=data, headers=headers)
+	try:
+		with urllib.request.urlopen(request, timeout=timeout) as response:
+			return json.loads(response.read())
+	except urllib.error.HTTPError as e:
+		body = json.loads(e.read() or b'{}')
+		raise RuntimeError(body.get('error', str(e))) from None
+
+
+def submit_job(payload, service_url=DEFAULT_SERVICE_URL):
+	"""Submit a job and return its id"""
+	return _request(f"{service_url}/jobs", payload)['id']
+
+
+def get_job(job_id, service_url=DEFAULT_SERVICE_URL):
+	"""Return a job's status and progress"""
+	return _request(f"{service_url}/jobs/{job_id}")
+
+
+def get_job_result(job_id, service_url=DEFAULT_SERVICE_URL):
+	"""Return a finished job's result"""
+	return _request(f"{service_url}/jobs/{job_id}/result")
+
+
+def wait_for_job(job_id, service_url=DEFAULT_SERVICE_URL, poll_interval=0.5, on_progress=None):
+	"""Poll until a job finishes and return its result
+
+	Args:
+		on_progress: Optional callback receiving the job status dict on every poll
+	"""
+	while True:
+		job = get_job(job_id, service_url)
+		if on_progress:
+			on_progress(job)
+		if job['status'] == 'done':
+			return get_job_result(job_id, service_url)
+		if job['status'] == 'failed':
+			raise RuntimeError(job['error'])
+		time.sleep(poll_interval)
+
+
+def encode_upload(name, data):
+	"""Build a 'files' entry for a count job from raw bytes"""
+	return {'name': name, 'content': base64.b64encode(data).decode('ascii')}
+
+
+if __name__ == '__main__':
+	port = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_PORT
+	workers = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+	serve(port, workers)
@@ -0,0 +1,127 @@
+"""
+Recursive, filtered directory walker
+
+Walks a project tree once with os.scandir and lazily yields matching file paths,
+so processing starts on the first file instead of after the whole tree is listed.
+
+Filtering:
+- include: glob patterns a file must match, e.g. ['*.json', '*.xlf']
+- exclude: glob patterns for files or directories to skip, e.g. ['backup', '*_old.json']
+- .locignore: per-directory ignore files (one glob per line, '#' comments,
+  trailing '/' for directory-only patterns) applying to that directory and below
+- max_size: skip files larger than this many bytes
+- follow_symlinks: follow symlinked files and directories (with loop protection)
+
+Patterns without '/' match the file or directory name; patterns with '/' match the
+path relative to the walk root (or to the .locignore's directory).
+"""
+
+import os
+from fnmatch import fnmatch
+
+IGNORE_FILE = '.locignore'
+
+
+def load_ignore_file(path):
+	"""Read glob patterns from an ignore file"""
+	patterns = []
+	with open(path, 'r', encoding='utf-8') as f:
+		for line in f:
+			line = line.strip()
+			if line and not line.startswith('#'):
+				patterns.append(line)
+	return patterns
+
+
+def _matches(patterns, name, rel_path, is_dir):
+	for pattern in patterns:
+		if pattern.endswith('/'):
+			if not is_dir:
+				continue
+			pattern = pattern.rstrip('/')
+		target = rel_path if '/' in pattern else name
+		if fnmatch(target, pattern.lstrip('/')):
+			return True
+	return False
+
+
+def walk_files(root, include=None, exclude=None, ignore_file=IGNORE_FILE, max_size=None,
+			   follow_symlinks=False, recursive=True):
+	"""Yield paths of matching files under root, depth-first in name order
+
+	Args:
+		root: Folder to walk
+		include: Glob patterns a file must match (default: every file)
+		exclude: Glob patterns for files/directories to skip
+		ignore_file: Name of per-directory ignore files (None to disable)
+		max_size: Maximum file size in bytes (None for no limit)
+		follow_symlinks: Follow symlinked files and directories
+		recursive: Descend into subdirectories
+	"""
+	exclude = list(exclude or [])
+	seen_dirs = set()
+
+	# Each stack entry: (directory, path relative to root, inherited ignore rules)
+	stack = [(root, '', [])]
+	while stack:
+		directory, rel_dir, rules = stack.pop()
+
+		try:
+			st = os.stat(directory)
+		except OSError:
+			continue
+		if (st.st_dev, st.st_ino) in seen_dirs:
+			continue
+		seen_dirs.add((st.st_dev, st.st_ino))
+
+		# Rules from this directory's ignore file are relative to it
+		if ignore_file:
+			ignore_path = os.path.join(directory, ignore_file)
+			if os.path.isfile(ignore_path):
+				rules = rules + [(rel_dir, load_ignore_file(ignore_path))]
+
+		try:
+			with os.scandir(directory) as it:
+				entries = sorted(it, key=lambda entry: entry.name)
+		except OSError as e:
+			print(f" ⚠️ Cannot read folder {directory}: {e}")
+			continue
+
+		subdirs = []
+		for entry in entries:
+			rel_path = f"{rel_dir}/{entry.name}" if rel_dir else entry.name
+
+			if entry.is_symlink() and not follow_symlinks:
+				continue
+
+			try:
+				is_dir = entry.is_dir()
+			except OSError:
+				continue
+
+			if _matches(exclude, entry.name, rel_path, is_dir):
+				continue
+			if any(_matches(patterns, entry.name, rel_path[len(base) + 1:] if base else rel_path, is_dir)
+				   for base, patterns in rules):
+				continue
+
+			if is_dir:
+				if recursive:
+					subdirs.append((entry.path, rel_path, rules))
+				continue
+
+			if entry.name == ignore_file:
+				continue
+			if include and not _matches(include, entry.name, rel_path, False):
+				continue
+			if max_size is not None:
+				try:
+					if entry.stat().st_size > max_size:
+						continue
+				except OSError:
+					continue
+
+			yield entry.path
+
+		# Reversed so subdirectories are visited in name order
+		stack.extend(reversed(subdirs))
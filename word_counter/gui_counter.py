@@ -2,14 +2,15 @@ import os
 import tkinter as tk
 from tkinter import filedialog, messagebox
 from tkinterdnd2 import DND_FILES, TkinterDnD
-import json
-from docx import Document
-import PyPDF2
 from datetime import datetime
 import pandas as pd
+from segments import get_reader
+from count_service import submit_job, get_job, get_job_result
 
 
 en_ko_rate = 0.15
+# Set to e.g. http://127.0.0.1:8765 to count on the shared count service
+SERVICE_URL = os.environ.get('LOC_COUNT_SERVICE_URL', '').rstrip('/')
 class WordCounterGUI:
 	def __init__(self, root):
 		self.root = root
@@ -31,7 +32,7 @@ class WordCounterGUI:
 		self.drop_frame.pack(pady=20)
 		self.drop_frame.pack_propagate(False)
 
-		self.drop_label = tk.Label(self.drop_frame, text="Drop files here\n\nSupported: JSON, XML, XLF, DOCX, PDF",
+		self.drop_label = tk.Label(self.drop_frame, text="Drop files here\n\nSupported: JSON, XML, XLF, TMX, PO, STRINGS, DOCX, PDF",
 									font=("Arial", 11), bg="#e0e0e0", fg="#666")
 		self.drop_label.place(relx=0.5, rely=0.5, anchor=tk.CENTER)
 
@@ -66,10 +67,13 @@ class WordCounterGUI:
 		files = filedialog.askopenfilenames(
 			title="Select files",
 			filetypes=[
-				("All Supported", "*.json *.xml *.xlf *.docx *.pdf"),
+				("All Supported", "*.json *.xml *.xlf *.xliff *.tmx *.po *.pot *.strings *.xcstrings *.docx *.pdf"),
 				("JSON files", "*.json"),
 				("XML files", "*.xml"),
-				("XLF files", "*.xlf"),
+				("XLF files", "*.xlf *.xliff"),
+				("TMX files", "*.tmx"),
+				("PO files", "*.po *.pot"),
+				("iOS strings", "*.strings *.xcstrings"),
 				("Word files", "*.docx"),
 				("PDF files", "*.pdf"),
 				("All files", "*.*")
@@ -84,36 +88,58 @@ class WordCounterGUI:
 		self.result_text.insert(tk.END, "Processing files...\n\n")
 		self.root.update()
 
+		if SERVICE_URL:
+			self.submit_to_service(files)
+			return
+
 		for filepath in files:
 			result = self.count_words_in_file(filepath)
 			if result:
 				self.results.append(result)
 		self.display_results()
 
+	def submit_to_service(self, files):
+		"""Queue the files on the count service and poll without blocking the UI"""
+		try:
+			job_id = submit_job({'type': 'count', 'paths': [os.path.abspath(f) for f in files]}, SERVICE_URL)
+		except Exception as e:
+			self.result_text.insert(tk.END, f"X Count service unavailable: {str(e)}\n")
+			return
+		self.root.after(500, self.poll_service, job_id)
+
+	def poll_service(self, job_id):
+		try:
+			job = get_job(job_id, SERVICE_URL)
+			if job['status'] == 'done':
+				response = get_job_result(job_id, SERVICE_URL)
+				self.results = response['results']
+				self.display_results()
+				for name in response['errors']:
+					self.result_text.insert(tk.END, f"⚠ Could not count: {name}\n")
+				return
+			if job['status'] == 'failed':
+				self.result_text.insert(tk.END, f"X Count job failed: {job['error']}\n")
+				return
+		except Exception as e:
+			self.result_text.insert(tk.END, f"X Count service error: {str(e)}\n")
+			return
+
+		progress = job['progress']
+		self.result_text.delete(1.0, tk.END)
+		self.result_text.insert(tk.END, f"Processing files on count service... {progress['done']}/{progress['total'] or '?'}\n")
+		self.root.after(500, self.poll_service, job_id)
+
 	def count_words_in_file(self, filepath):
 		filename = os.path.basename(filepath)
-		_, ext = os.path.splitext(filename)
-		ext = ext.lower()
+
+		reader = get_reader(filename)
+		if reader is None:
+			self.result_text.insert(tk.END, f"⚠ Unsupported: {filename}\n")
+			return None
+		file_type, iter_file_segments = reader
 
 		try:
-			if ext == ".json":
-				text = self.extract_from_json(filepath)
-				file_type = 'JSON'
-			elif ext in ['.xml', '.xlf']:
-				text = self.extract_from_xml(filepath)
-				file_type = 'XML/XLF'
-			elif ext == '.docx':
-				text = self.extract_from_docx(filepath)
-				text = self.extract_from_docx(filepath)
-				file_type = 'DOCX'
-			elif ext =='.pdf':
-				text = self.extract_from_pdf(filepath)
-				file_type = 'PDF'
-			else:
-				self.result_text.insert(tk.END, f"⚠ Unsupported: {filename}\n")
-				return None
-
-			words = len(text.split()) if text else 0
+			words = sum(segment.words for segment in iter_file_segments(filepath))
 			return {
 				'filename': filename,
 				'file_type': file_type,
@@ -124,31 +150,6 @@ class WordCounterGUI:
 			self.result_text.insert(tk.END, f"X Error with {filename}: {str(e)}\n")
 			return None
 
-	def extract_from_json(self, filepath):
-		def get_strings(obj):
-			text = []
-			if isinstance(obj, dict):
-				for value in obj.values():
-					text.extend(get_strings(value))
-			elif isinstance(obj, list):
-				for item in obj:
-					text.extend(get_strings(item))
-			elif isinstance(obj, str):
-				text.append(obj)
-			return text
-
-		with open(filepath, 'r', encoding='utf-8') as f:
-			data = json.load(f)
-		return ' '.join(get_strings(data))
-
-	def extract_from_pdf(self, filepath):
-		text = []
-		with open(filepath, 'rb') as f:
-			pdf = PyPDF2.PdfReader(f)
-			for page in pdf.pages:
-				text.append(page.extract_text())
-		return ' '.join(text)
-
 	def display_results(self):
 		self.result_text.delete(1.0, tk.END)
 
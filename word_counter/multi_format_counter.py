@@ -1,200 +1,377 @@
+import io
 import os
-import glob
-import json
-import xml.etree.ElementTree as ET
-from docx import Document
-import PyPDF2
+import tarfile
+import zipfile
+import warnings
+import multiprocessing
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 import pandas as pd
 from datetime import datetime
-
-def extract_text_from_json(filepath):
-	"""Extract text from JSON file"""
-	def extract_strings(obj):
-		text = []
-		if isinstance(obj, dict):
-			for value in obj.values():
-				text.extend(extract_strings(value))
-		elif isinstance(obj, list):
-			for item in obj:
-				text.extend(extract_strings(item))
-		elif isinstance(obj, str):
-			text.append(obj)
-		return text
-
+from archive_reader import ARCHIVE_PATTERNS, is_archive, is_xliff, qualified_name, iter_archive_jobs, extract_member_segments, close_zip_file
+from repetition_analyzer import RepetitionAnalyzer, MATCH_BANDS
+from file_walker import walk_files
+from prefetch_reader import iter_prefetched, DEFAULT_DEPTH, DEFAULT_MEMORY_BUDGET
+from result_store import new_run_id
+from cost_engine import CostEngine, load_rate_table, flat_rate_table, format_cost
+from string_analysis import analyze_string
+from segments import SUPPORTED_PATTERNS, XLIFF_STATES, get_reader, iter_xliff_segment_states, iter_json_segments, iter_xml_segments, iter_docx_segments, iter_pdf_segments
+
+# Rates, file type multipliers and band weights (edit rates.json)
+RATE_TABLE = load_rate_table()
+
+def _join_segments(reader, filepath, label):
+	"""Join the segments of a file into one text blob"""
 	try:
-		with open(filepath, 'r', encoding='utf-8') as file:
-			data = json.load(file)
-		all_text = extract_strings(data)
-		return ' '.join(all_text)
+		return ' '.join(segment.text for segment in reader(filepath))
 	except Exception as e:
-		print(f" X Error reading JSON: {e}")
+		print(f" X Error reading {label}: {e}")
 		return ""
 
+def extract_text_from_json(filepath):
+	"""Extract text from JSON file"""
+	return _join_segments(iter_json_segments, filepath, 'JSON')
+
 def extract_text_from_xml(filepath):
 	"""Extract text from XML/XLF file
 	For XLF files: extract only source text (not target)
 	for other XML: extrac all text
 	"""
-	try:
-		tree = ET.parse(filepath)
-		root = tree.getroot()
-
-		all_text = []
-
-		# Check if this is an XLIFF file
-		is_xliff = False
-		if 'xliff' in root.tag.lower() or any('xliff' in elem.tag.lower() for elem in root.iter()):
-			is_xliff = True
-		if is_xliff:
-			namespaces = {'xliff': 'urn:oasis:names:tc:xliff:document:1.2'}
-
-			sources = root.findall('.//xliff:source', namespaces)
-
-			if not sources:
-				sources = root.findall('//{*}source')
-			if not sources:
-				for elem in root.iter():
-					if 'source' in elem.tag.lower():
-						if elem.text and elem.text.strip():
-							all_text.append(elem.text.strip())
-			else:
-				for source in sources:
-					if source.text and source.text.strip():
-						all_text.append(source.text.strip())
-		else:
-			for elem in root.iter():
-				if elem.text and elem.text.strip():
-					all_text.append(elem.text.strip())
-				if elem.tail and elem.tail.strip():
-					all_text.append(elem.tail.strip())
-		return ' '.join(all_text)
-
-	except Exception as e:
-		print(f" X Error reading XML: {e}")
-		return ""
-
+	return _join_segments(iter_xml_segments, filepath, 'XML')
 
 def extract_text_from_docx(filepath):
 	"""Extract text from Word doc"""
-	try:
-		doc = Document(filepath)
-		text = []
-		#Extract text from paragraph
-		for paragraph in doc.paragraphs:
-			if paragraph.text.strip():
-				text.append(paragraph.text)
-		#Extract text from tables
-		for table in doc.tables:
-			for row in table.rows:
-				for cell in row.cells:
-					if cell.text.strip():
-						text.append(cell.text)
-
-		return ' '.join(text)
-	except Exception as e:
-		print(f" X Error reading DOCX: {e}")
-		return ""
+	return _join_segments(iter_docx_segments, filepath, 'DOCX')
 
 def extract_text_from_pdf(filepath):
 	"""Extract text from PDF"""
-	try:
-		text = []
-		with open(filepath, 'rb') as file:
-			pdf_reader = PyPDF2.PdfReader(file)
-
-			#Extract text from each page
-			for page_num in range(len(pdf_reader.pages)):
-				page = pdf_reader.pages[page_num]
-				page_text = page.extract_text()
-				if page_text.strip():
-					text.append(page_text)
-
-		return ' '.join(text)
-	except Exception as e:
-		print(f" X Error reading PDF: {e}")
-		return ""
+	return _join_segments(iter_pdf_segments, filepath, 'PDF')
+
+def _tally_segments(segments, filename, file_type, analyzer=None, tm=None, segment_writer=None, strip_tags=False):
+	"""Count words over a segment stream in a single pass
 
-def count_words_in_file(filepath):
-	filename = os.path.basename(filepath)
+	With strip_tags, words are counted with tags and {placeholders} removed (as
+	ExcelColumnCounter does), and the raw count and tagged strings are reported too.
+
+	Returns:
+		Result dict, or None if the stream had no words
+	"""
+	words = 0
+	words_with_tags = 0
+	strings_with_tags = 0
+	bands = dict.fromkeys(MATCH_BANDS, 0)
+	leverage = {'tm_matched_words': 0, 'tm_fuzzy_words': 0, 'new_words': 0}
+	for segment in segments:
+		if strip_tags:
+			# Repeated strings are served from the shared string cache
+			analysis = analyze_string(segment.text)
+			if not analysis.words:
+				continue
+			words_with_tags += analysis.words
+			if analysis.cleaned != ' '.join(segment.text.split()):
+				strings_with_tags += 1
+			segment_words = analysis.clean_words
+		else:
+			segment_words = segment.words
+		if not segment_words:
+			continue
+		words += segment_words
+		band = tm_match = None
+		if analyzer is not None:
+			band = analyzer.add_segment(segment.text)
+			bands[band] += segment_words
+		if tm is not None:
+			tm_match = tm.match_type(segment.text)
+			leverage[tm_match] += segment_words
+		if segment_writer is not None:
+			segment_writer.add(segment, band, tm_match, filename)
+
+	if not words and not words_with_tags:
+		return None
+
+	result = {
+		'filename': filename,
+		'file_type': file_type,
+		'words': words
+	}
+	if strip_tags:
+		result['words_with_tags'] = words_with_tags
+		result['words_without_tags'] = words
+		result['strings_with_tags'] = strings_with_tags
+	if analyzer is not None:
+		result['bands'] = bands
+	if tm is not None:
+		result.update(leverage)
+	return result
+
+def _track_states(segment_states, states, strip_tags=False):
+	"""Pass segments through, adding their words to their XLIFF state bucket"""
+	for segment, state in segment_states:
+		states[state] += analyze_string(segment.text).clean_words if strip_tags else segment.words
+		yield segment
+
+def count_words_in_file(filepath, analyzer=None, tm=None, segment_writer=None, data=None, progress=False,
+						strip_tags=False, name=None):
+	"""Count words in a single file
+
+	Args:
+		filepath: Path to the file
+		analyzer: Optional RepetitionAnalyzer shared across the job; when given,
+			the result also carries per-band word counts
+		tm: Optional TranslationMemory; when given, the result also carries
+			TM leverage (tm_matched_words, tm_fuzzy_words, new_words)
+		segment_writer: Optional result_store.SegmentWriter receiving every segment
+		data: The file's bytes if already read (prefetched); otherwise read from filepath
+		progress: For XLIFF files, also split words by target state (New, Translated,
+			Approved, Locked), read in the same pass
+		strip_tags: Count words without tags and {placeholders}; the result also carries
+			words_with_tags, words_without_tags and strings_with_tags
+		name: Name reported for the file and its segments (default: base name)
+	"""
+	filename = name or os.path.basename(filepath)
 	_, ext = os.path.splitext(filename)
 	ext = ext.lower()
 
 	print(f" Processing: {filename}")
 	#Route to appropriate extractor based on file type
-	if ext == '.json':
-		text = extract_text_from_json(filepath)
-		file_type = 'JSON'
-	elif ext in ['.xml', '.xlf']:
-		text = extract_text_from_xml(filepath)
-		file_type = 'XML/XLF'
-	elif ext == '.docx':
-		text = extract_text_from_docx(filepath)
-		file_type = 'DOCX'
-	elif ext == '.pdf':
-		text = extract_text_from_pdf(filepath)
-		file_type = 'PDF'
-	else:
+	reader = get_reader(filename)
+	if reader is None:
 		print(f" ⚠️ Unsupported file type: {ext}")
 		return None
+	file_type, iter_file_segments = reader
 
-	# Count words
-	if text:
-		words = len(text.split())
-		print(f" ✓ {words:,} words")
-		return {
-			'filename': filename,
-			'file_type': file_type,
-			'words': words
-		}
+	source = filepath
+	if data is not None:
+		source = io.BytesIO(data)
+		source.name = filepath
+
+	states = None
+	try:
+		if progress and ext in ('.xlf', '.xliff'):
+			states = dict.fromkeys(XLIFF_STATES, 0)
+			segments = _track_states(iter_xliff_segment_states(source), states, strip_tags)
+		else:
+			segments = iter_file_segments(source)
+		result = _tally_segments(segments, filename, file_type, analyzer, tm, segment_writer, strip_tags)
+	except Exception as e:
+		print(f" X Error reading {file_type}: {e}")
+		return None
+
+	if result and states is not None:
+		result['states'] = states
+
+	if result:
+		print(f" ✓ {result['words']:,} words")
+		return result
 	else:
 		print(f" ⚠️ No text extracted")
 		return None
 
-def analyze_folder(folder_path, file_patterns=None):
-	"""Analyze all supported files in a folder
+def count_words_in_stream(stream, filename, analyzer=None, tm=None, segment_writer=None, strip_tags=False):
+	"""Count words in an open file object (upload, archive member, service payload)
+
+	Returns:
+		Result dict, or None if the file is unsupported or has no words
+	Raises:
+		Parse errors from the extractor
+	"""
+	reader = get_reader(filename)
+	if reader is None:
+		return None
+	file_type, iter_file_segments = reader
+	return _tally_segments(iter_file_segments(stream), filename, file_type, analyzer, tm, segment_writer, strip_tags)
+
+def archive_pool(workers=None):
+	"""Process pool for parsing archive members
+
+	Workers are spawned rather than forked: callers such as analyze_folder have
+	prefetch threads running, and forking a multi-threaded process can deadlock.
+	"""
+	return ProcessPoolExecutor(max_workers=workers or os.cpu_count() or 1,
+							   mp_context=multiprocessing.get_context('spawn'))
+
+def count_words_in_archive(archive_path, analyzer=None, tm=None, segment_writer=None, workers=None,
+						   strip_tags=False, name=None, progress=False, executor=None):
+	"""Count words in every supported member of a zip/tar archive, without extracting it
+
+	Members are parsed in worker processes; results come back in archive order and
+	are named 'archive.zip!/path/in/archive.json'.
+
+	Args:
+		archive_path: Path to the .zip/.tar/.tar.gz archive
+		workers: Number of worker processes (default: CPU count, 1 to parse inline)
+		strip_tags: Count words without tags and {placeholders}
+		name: Name of the archive in reported member names (default: base name)
+		progress: For XLIFF members, also split words by target state, as count_words_in_file does
+		executor: Optional pool from archive_pool, shared across archives (default: a pool
+			for this archive only)
+	"""
+	archive_name = name or os.path.basename(archive_path)
+	print(f" Processing archive: {archive_name}")
+
+	workers = workers or os.cpu_count() or 1
+	results = []
+
+	def handle(member_name, file_type, segments):
+		name = qualified_name(archive_name, member_name)
+		print(f" Processing: {name}")
+		if isinstance(segments, str):
+			print(f" X Error reading {file_type}: {segments}")
+			return
+		states = None
+		if progress and is_xliff(member_name):
+			states = dict.fromkeys(XLIFF_STATES, 0)
+			segments = _track_states(segments, states, strip_tags)
+		result = _tally_segments(segments, name, file_type, analyzer, tm, segment_writer, strip_tags)
+		if result:
+			if states is not None:
+				result['states'] = states
+			print(f" ✓ {result['words']:,} words")
+			results.append(result)
+		else:
+			print(" ⚠️ No text extracted")
+
+	try:
+		jobs = iter_archive_jobs(archive_path)
+		if workers == 1:
+			for member_name, data in jobs:
+				handle(member_name, *extract_member_segments(archive_path, member_name, data, progress))
+			return results
+
+		own_executor = executor is None
+		if own_executor:
+			executor = archive_pool(workers)
+		try:
+			# Bounded window of in-flight members keeps memory flat on large tars
+			pending = deque()
+			for member_name, data in jobs:
+				pending.append((member_name, executor.submit(extract_member_segments, archive_path, member_name,
+															 data, progress)))
+				if len(pending) >= workers * 2:
+					member_name, future = pending.popleft()
+					handle(member_name, *future.result())
+			while pending:
+				member_name, future = pending.popleft()
+				handle(member_name, *future.result())
+		finally:
+			if own_executor:
+				executor.shutdown()
+	except (zipfile.BadZipFile, tarfile.TarError, OSError) as e:
+		print(f" X Error reading archive {archive_name}: {e}")
+	finally:
+		# Workers keep only their latest zip open; the sequential path used this process's copy
+		close_zip_file(archive_path)
+
+	return results
+
+def analyze_folder(folder_path, file_patterns=None, repetitions=False, tm=None, store=None, run_id=None,
+				   exclude=None, max_file_size=None, follow_symlinks=False, recursive=True, workers=None,
+				   prefetch=DEFAULT_DEPTH, prefetch_memory=DEFAULT_MEMORY_BUDGET, progress=False, strip_tags=False):
+	"""Analyze all supported files in a folder and its subfolders
 	Args:
 		folder_path: Path to folder containing files
 		file_patterns: List of patterns like ['*.json', '*.xml']
 		If None, searches for all supported types
+		exclude: Glob patterns for files/folders to skip (a .locignore file works too)
+		max_file_size: Skip files larger than this many bytes
+		follow_symlinks: Follow symlinked files and folders
+		recursive: Include subfolders
+		workers: Worker processes used for archive members (zip/tar files are read in place)
+		prefetch: Number of files read ahead in background threads while parsing (0 to disable)
+		prefetch_memory: Upper bound in bytes on prefetched file contents held at once
+		repetitions: Split each file's words into repetition/fuzzy match bands
+		tm: Optional TranslationMemory to report per-file TM leverage against
+		store: Optional ResultStore; file and segment tables are written under run_id
+		run_id: Run partition for the store (default: current timestamp)
+		progress: Split XLIFF words by target state so estimates cover only remaining work
+		strip_tags: Count words without tags and {placeholders}, like ExcelColumnCounter
 	"""
 
 	# Default patterns for all supported types
 	if file_patterns is None:
-		file_patterns = ['*.json', '*.xml','*.xlf', '*.docx', '*.pdf']
-
-	# Find all matching files
-	all_files = []
-	for pattern in file_patterns:
-		search_path = os.path.join(folder_path, pattern)
-		all_files.extend(glob.glob(search_path))
+		file_patterns = SUPPORTED_PATTERNS + ARCHIVE_PATTERNS
 
-	if not all_files:
-		print(f"\nX No supported files found in {folder_path}")
-		print(f" Looking for: {', '.join(file_patterns)}")
-		return None
+	# Files are found lazily in a single pass over the tree
+	all_files = walk_files(folder_path, include=file_patterns, exclude=exclude, max_size=max_file_size,
+						   follow_symlinks=follow_symlinks, recursive=recursive)
 
 	print(f"\n{'='*70}")
 	print(f"ANALYZING FOLDER: {folder_path}")
 	print(f"\n{'=' * 70}")
-	print(f"Found {len(all_files)} file(s_ to analyze\n")
 
+	files_found = 0
 	results = []
-
-	# Process each file
-	for filepath in all_files:
-		result = count_words_in_file(filepath)
-		if result:
-			results.append(result)
-		print()
+	analyzer = RepetitionAnalyzer() if repetitions else None
+	segment_writer = None
+	if store is not None:
+		run_id = run_id or new_run_id()
+		segment_writer = store.segment_writer(run_id)
+
+	# One member pool for every archive in the folder, started on the first archive
+	executor = None
+	try:
+		# Process each file; upcoming files are read in the background while parsing
+		for filepath, data in iter_prefetched(all_files, prefetch, prefetch_memory, skip=is_archive):
+			files_found += 1
+			if is_archive(filepath):
+				if executor is None and (workers or os.cpu_count() or 1) > 1:
+					executor = archive_pool(workers)
+				# Relative paths keep same-named files in different subfolders apart, in the
+				# file and segment tables alike
+				archive_results = count_words_in_archive(filepath, analyzer, tm, segment_writer, workers, strip_tags,
+														 name=os.path.relpath(filepath, folder_path),
+														 progress=progress, executor=executor)
+				results.extend(archive_results)
+				print()
+				continue
+			result = count_words_in_file(filepath, analyzer, tm, segment_writer, data, progress, strip_tags,
+										 name=os.path.relpath(filepath, folder_path))
+			if result:
+				results.append(result)
+			print()
+	finally:
+		if executor is not None:
+			executor.shutdown()
+
+	if segment_writer is not None:
+		segment_writer.close()
+
+	if not files_found:
+		print(f"\nX No supported files found in {folder_path}")
+		print(f" Looking for: {', '.join(file_patterns)}")
+		return None
+	print(f"Analyzed {files_found} file(s)\n")
 
 	if not results:
 		print("X No files processed successfully")
 		return None
+
+	if store is not None:
+		path = store.write_file_results(results, run_id)
+		print(f"✓ Results stored: {path} ({segment_writer.rows:,} segments)\n")
 	return results
 
-def display_summary(results, cost_per_word=0.15):
+def _resolve_rate_table(rate_table, cost_per_word):
+	"""Rate table for display_summary/export_to_excel, mapping the deprecated cost_per_word"""
+	# Older callers passed cost_per_word positionally, where rate_table is now
+	if isinstance(rate_table, (int, float)):
+		rate_table, cost_per_word = None, rate_table
+	if cost_per_word is not None:
+		warnings.warn("cost_per_word is deprecated; pass a rate_table from load_rate_table or flat_rate_table",
+					  DeprecationWarning, stacklevel=3)
+		return flat_rate_table(cost_per_word, RATE_TABLE)
+	return rate_table or RATE_TABLE
+
+def display_summary(results, rate_table=None, cost_per_word=None):
+	"""Print word counts, match bands, TM leverage, XLIFF progress and cost per target language
+
+	Args:
+		rate_table: Dict from load_rate_table (default: rates.json)
+		cost_per_word: Deprecated; prices every word at this flat rate instead of rate_table
+	"""
 	if not results:
 		return
+	rate_table = _resolve_rate_table(rate_table, cost_per_word)
 	print("="*70)
 	print("SUMMARY REPORT")
 	print("="*70)
@@ -205,6 +382,7 @@ def display_summary(results, cost_per_word=0.15):
 
 	# Sort by file type, then by words (descending)
 	results.sort(key=lambda x: (x['file_type'], -x['words']))
+	engine = CostEngine(results, rate_table)
 
 	for result in results:
 		print(f"{result['filename']:<35} {result['file_type']:<12} {result['words']:>10,}")
@@ -214,36 +392,126 @@ def display_summary(results, cost_per_word=0.15):
 	print(f"{'TOTAL':<35} {'':<12} {total_words:>10,}")
 	print("=" * 70)
 
-	estimated_cost = total_words * cost_per_word
-	estimated_hours = total_words / 250 # 250 words per hour
+	# Tag stripping: words above are clean counts
+	if all('words_with_tags' in result for result in results):
+		print(f"\nWords (with tags): {sum(r['words_with_tags'] for r in results):,}")
+		print(f"Words (clean): {total_words:,}")
+		print(f"Strings with tags: {sum(r['strings_with_tags'] for r in results):,}")
+		print("=" * 70)
+
+	# Match analysis: quote weighted words instead of raw totals
+	if all('bands' in result for result in results):
+		print(f"\n{'Match Band':<35} {'':<12} {'Words':>10}")
+		print("-" * 70)
+		for band in MATCH_BANDS:
+			band_words = sum(result['bands'][band] for result in results)
+			print(f"{band:<35} {'':<12} {band_words:>10,}")
+		# Same figure the costs are priced on (rate table weights, multipliers, progress)
+		print("-" * 70)
+		print(f"{'WEIGHTED WORDS':<35} {'':<12} {engine.weighted_words.sum():>10,.0f}")
+		print("=" * 70)
+
+	# TM leverage: words already covered by previous translations
+	if all('new_words' in result for result in results):
+		print(f"\n{'TM Leverage':<35} {'Matched':>10} {'Fuzzy':>10} {'New':>10}")
+		print("-" * 70)
+		for result in results:
+			print(f"{result['filename']:<35} "
+				  f"{result['tm_matched_words']:>10,} "
+				  f"{result['tm_fuzzy_words']:>10,} "
+				  f"{result['new_words']:>10,}")
+		print("-" * 70)
+		print(f"{'TOTAL':<35} "
+			  f"{sum(r['tm_matched_words'] for r in results):>10,} "
+			  f"{sum(r['tm_fuzzy_words'] for r in results):>10,} "
+			  f"{sum(r['new_words'] for r in results):>10,}")
+		print("=" * 70)
+
+	# XLIFF progress: only untranslated units are left to quote
+	if any('states' in result for result in results):
+		print(f"\n{'XLIFF Progress':<31} {'New':>9} {'Translated':>10} {'Approved':>9} {'Locked':>8}")
+		print("-" * 70)
+		for result in results:
+			if 'states' in result:
+				states = result['states']
+				print(f"{result['filename']:<31} "
+					  f"{states['New']:>9,} "
+					  f"{states['Translated']:>10,} "
+					  f"{states['Approved']:>9,} "
+					  f"{states['Locked']:>8,}")
+		print("-" * 70)
+		totals = [sum(r['states'][state] for r in results if 'states' in r) for state in XLIFF_STATES]
+		print(f"{'TOTAL':<31} {totals[0]:>9,} {totals[1]:>10,} {totals[2]:>9,} {totals[3]:>8,}")
+		# Only XLIFF files have progress states; other files are quoted in full below
+		print(f"{'REMAINING WORDS (XLIFF)':<31} {totals[0]:>9,}")
+		print("=" * 70)
+
+	# Billable words: band weights, file type multipliers and XLIFF progress applied
+	billable_words = engine.weighted_words.sum()
+	estimated_hours = billable_words / 250 # 250 words per hour
+
+	print(f"\n{'Target Language':<35} {'Rate':>12} {'Cost':>19}")
+	print("-" * 70)
+	for _, row in engine.costs_by_language().iterrows():
+		print(f"{row['Target Language']:<35} "
+			  f"{format_cost(row[engine.rate_column], engine.currency):>12} "
+			  f"{format_cost(row[engine.cost_column], engine.currency):>19}")
+	print("=" * 70)
 
 	print(f"\nTotal files processed: {len(results)}")
 	print(f"Total words: {total_words:,}")
-	print(f"Estimated translation cost: ${estimated_cost:,.2f} (at ${cost_per_word}/word)")
+	print(f"Billable words: {billable_words:,.0f}")
+	print(f"Estimated translation cost: {format_cost(engine.total_cost(), engine.currency)} "
+		  f"({len(engine.languages)} target language(s))")
 	print(f"Estimated time: {estimated_hours:.1f} hours (at 250 words/hour)")
 	print("=" * 70)
 
-def export_to_excel(results, cost_per_word=0.15):
+def export_to_excel(results, rate_table=None, cost_per_word=None):
+	"""Save the counts with one cost column per target language to an Excel report
+
+	Args:
+		rate_table: Dict from load_rate_table (default: rates.json)
+		cost_per_word: Deprecated; prices every word at this flat rate instead of rate_table
+	"""
 	if not results:
 		return
 
+	engine = CostEngine(results, _resolve_rate_table(rate_table, cost_per_word))
+	file_costs = engine.costs_by_file()
+
+	has_bands = all('bands' in result for result in results)
+	has_states = any('states' in result for result in results)
+
 	data = []
-	for result in results:
-		data.append({
+	for index, result in enumerate(results):
+		row = {
 			'File Name': result['filename'],
 			'Type': result['file_type'],
-			'Words': result['words'],
-			'Cost (USD)': round(result['words'] * cost_per_word, 2)
-		})
+			'Words': result['words']
+		}
+		if has_bands:
+			row.update(result['bands'])
+			# The words the cost columns price
+			row['Weighted Words'] = file_costs['Weighted Words'][index]
+		if 'new_words' in result:
+			row['TM Matched'] = result['tm_matched_words']
+			row['TM Fuzzy'] = result['tm_fuzzy_words']
+			row['New Words'] = result['new_words']
+		if 'words_with_tags' in result:
+			row['Words (With Tags)'] = result['words_with_tags']
+			row['Strings with Tags'] = result['strings_with_tags']
+		if has_states:
+			states = result.get('states', {'New': result['words']})
+			for state in XLIFF_STATES:
+				row[f'{state} (XLIFF)'] = states.get(state, 0)
+		data.append(row)
 
 	df = pd.DataFrame(data)
+	for language in engine.languages:
+		df[f'{language} ({engine.currency})'] = file_costs[language]
 
-	totals = {
-		'File Name': 'TOTAL',
-		'Type': '',
-		'Words': df['Words'].sum(),
-		'Cost (USD)': df['Cost (USD)'].sum()
-	}
+	totals = {column: df[column].sum() for column in df.columns if column not in ('File Name', 'Type')}
+	totals.update({'File Name': 'TOTAL', 'Type': ''})
 	df = pd.concat([df, pd.DataFrame([totals])], ignore_index=True)
 	output_file = f"multi_format_report_{datetime.now().strftime('%Y%m%d-%H%M%S')}.xlsx"
 
@@ -255,14 +523,14 @@ if __name__ == '__main__':
 	print("\n" + "="*70)
 	print("MULTI-FORMAT LOCALIZATION WORD COUNTER")
 	print("="*70)
-	print("Supported formats: JSON, XML, XLF, DOCX, PDF")
+	print("Supported formats: JSON, XML, XLF/XLIFF, TMX, PO/POT, STRINGS, XCSTRINGS, DOCX, PDF")
 	print("="*70)
 
 	folder_path = "/Users/inyoungkim/PycharmProjects/localization-workflow-toolkit/word_counter/test_files"
 
-	results = analyze_folder(folder_path)
+	results = analyze_folder(folder_path, repetitions=True)
 
 	if results:
-		display_summary(results, cost_per_word=0.15)
-		export_to_excel(results, cost_per_word=0.15)
+		display_summary(results)
+		export_to_excel(results)
 
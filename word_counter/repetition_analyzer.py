@@ -0,0 +1,171 @@
+"""
+Repetition and fuzzy-match analysis for localization word counts
+
+Splits the volume of a job into the match bands used in translation quotes:
+- Repetitions: segments already seen earlier in the job (exact, after normalization)
+- 95-99%, 85-94%, 75-84%: fuzzy matches against earlier segments
+- No Match: new words
+
+Exact repeats are found with a hash of the normalized segment. Fuzzy candidates
+come from a MinHash/LSH index over character shingles, so each segment is only
+compared against a handful of similar segments instead of everything seen so far.
+"""
+
+import zlib
+from difflib import SequenceMatcher
+import numpy as np
+from segments import normalize_segment, segment_hash
+
+MATCH_BANDS = ['Repetitions', '95-99%', '85-94%', '75-84%', 'No Match']
+
+# Share of the full word rate charged per band
+MATCH_BAND_WEIGHTS = {
+	'Repetitions': 0.25,
+	'95-99%': 0.30,
+	'85-94%': 0.60,
+	'75-84%': 0.80,
+	'No Match': 1.00,
+}
+
+# Lower bound (in %) of each fuzzy band
+FUZZY_BANDS = [(95, '95-99%'), (85, '85-94%'), (75, '75-84%')]
+
+_PRIME = (1 << 31) - 1
+
+
+def shingle_hashes(text, size=3):
+	"""Hash the character n-grams of a normalized segment
+
+	Character shingles work for both spaced (EN) and agglutinative (KO/JA) text.
+	"""
+	text = normalize_segment(text).casefold()
+	if len(text) <= size:
+		grams = {text}
+	else:
+		grams = {text[i:i + size] for i in range(len(text) - size + 1)}
+	return np.fromiter((zlib.crc32(g.encode('utf-8')) & _PRIME for g in grams),
+						dtype=np.int64, count=len(grams))
+
+
+def match_band(similarity):
+	"""Map a similarity percentage to its quote band"""
+	for lower, band in FUZZY_BANDS:
+		if similarity >= lower:
+			return band
+	return 'No Match'
+
+
+def weighted_word_count(bands, weights=None):
+	"""Apply band weights to a {band: words} dict"""
+	if weights is None:
+		weights = MATCH_BAND_WEIGHTS
+	return sum(words * weights.get(band, 1.0) for band, words in bands.items())
+
+
+class RepetitionAnalyzer:
+	"""Classify segments into match bands against everything seen earlier in the job"""
+
+	def __init__(self, num_perm=64, bands=16, shingle_size=3, max_bucket_size=50, max_candidates=3):
+		"""
+		Args:
+			num_perm: Number of MinHash permutations (signature length)
+			bands: Number of LSH bands; num_perm must be divisible by it
+			shingle_size: Character n-gram size
+			max_bucket_size: Cap on segments kept per LSH bucket, keeps lookups near-linear
+			max_candidates: Number of best candidates scored with an exact similarity
+		"""
+		if num_perm % bands:
+			raise ValueError("num_perm must be divisible by bands")
+
+		self.num_perm = num_perm
+		self.bands = bands
+		self.rows = num_perm // bands
+		self.shingle_size = shingle_size
+		self.max_bucket_size = max_bucket_size
+		self.max_candidates = max_candidates
+
+		# Fixed seed so the same job always produces the same bands
+		rng = np.random.default_rng(20240101)
+		self._a = rng.integers(1, _PRIME, size=(num_perm, 1), dtype=np.int64)
+		self._b = rng.integers(0, _PRIME, size=(num_perm, 1), dtype=np.int64)
+
+		self.seen_hashes = set()
+		self.buckets = {}
+		self.signatures = np.empty((1024, num_perm), dtype=np.int64)
+		self.texts = []
+
+	def signature(self, text):
+		"""Return the MinHash signature of a segment"""
+		hashes = shingle_hashes(text, self.shingle_size)
+		return ((self._a * hashes + self._b) % _PRIME).min(axis=1)
+
+	def _band_keys(self, signature):
+		rows = self.rows
+		return [(i, signature[i * rows:(i + 1) * rows].tobytes()) for i in range(self.bands)]
+
+	def best_match(self, text, signature=None):
+		"""Return the best fuzzy similarity (0-100) against indexed segments"""
+		if signature is None:
+			signature = self.signature(text)
+
+		candidates = set()
+		for key in self._band_keys(signature):
+			candidates.update(self.buckets.get(key, ()))
+		if not candidates:
+			return 0
+
+		# Rank by estimated Jaccard, then score the best few exactly
+		candidates = np.fromiter(candidates, dtype=np.int64, count=len(candidates))
+		agreement = (self.signatures[candidates] == signature).sum(axis=1)
+		if len(candidates) > self.max_candidates:
+			top = np.argpartition(-agreement, self.max_candidates)[:self.max_candidates]
+			candidates, agreement = candidates[top], agreement[top]
+		ranked = candidates[np.argsort(-agreement)]
+
+		normalized = normalize_segment(text)
+		best = 0
+		for idx in ranked:
+			matcher = SequenceMatcher(None, normalized, self.texts[idx], autojunk=False)
+			if matcher.quick_ratio() * 100 <= best:
+				continue
+			best = max(best, matcher.ratio() * 100)
+		return best
+
+	def add_segment(self, text):
+		"""Classify a segment and add it to the index
+
+		Returns:
+			Match band name
+		"""
+		digest = segment_hash(text)
+		if digest in self.seen_hashes:
+			return 'Repetitions'
+		self.seen_hashes.add(digest)
+
+		signature = self.signature(text)
+		band = match_band(self.best_match(text, signature))
+
+		idx = len(self.texts)
+		if idx == len(self.signatures):
+			self.signatures = np.resize(self.signatures, (idx * 2, self.num_perm))
+		self.signatures[idx] = signature
+		self.texts.append(normalize_segment(text))
+		for key in self._band_keys(signature):
+			bucket = self.buckets.setdefault(key, [])
+			if len(bucket) < self.max_bucket_size:
+				bucket.append(idx)
+
+		return band
+
+	def add_file(self, segments):
+		"""Classify all segments of a file
+
+		Returns:
+			Dict of {band: words} covering every band in MATCH_BANDS
+		"""
+		bands = dict.fromkeys(MATCH_BANDS, 0)
+		for text in segments:
+			words = len(text.split())
+			if words:
+				bands[self.add_segment(text)] += words
+		return bands
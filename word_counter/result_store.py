@@ -0,0 +1,232 @@
+"""
+Columnar (Parquet) store for scan and QA results
+
+Layout (hive-style partitions, one folder per project and run):
+	<root>/files/project=<project>/run=<run>/part-0.parquet       one row per file
+	<root>/segments/project=<project>/run=<run>/part-0.parquet    one row per segment
+	<root>/qa_issues/project=<project>/run=<run>/locale=<locale>/part-<uuid>.parquet
+	                                                              one row per QA issue
+
+Aggregations (cost by language, words by file type, trends across runs) are
+vectorized pandas queries over these tables.
+"""
+
+import os
+import uuid
+from datetime import datetime
+import pandas as pd
+
+try:
+	import pyarrow as pa
+	import pyarrow.parquet as pq
+except ImportError:
+	pa = None
+	pq = None
+
+DEFAULT_STORE_ROOT = 'scan_results'
+
+
+def _require_pyarrow():
+	if pa is None:
+		raise ImportError("pyarrow is not installed.\n\nPlease run:\npip install pyarrow")
+
+
+def new_run_id():
+	"""Return a sortable run id based on the current time (microsecond resolution)"""
+	return datetime.now().strftime('%Y%m%d-%H%M%S-%f')
+
+
+class SegmentWriter:
+	"""Stream segment rows into a Parquet file in fixed-size record batches"""
+
+	COLUMNS = ['file', 'key', 'offset', 'words', 'text', 'band', 'tm_match']
+
+	def __init__(self, path, batch_size=100_000):
+		self.path = path
+		self.batch_size = batch_size
+		self.rows = 0
+		self._writer = None
+		self._reset()
+
+	def _reset(self):
+		self._columns = {name: [] for name in self.COLUMNS}
+
+	def add(self, segment, band=None, tm_match=None, filename=None):
+		"""Append one Segment, with its match band and TM bucket if known
+
+		Args:
+			filename: File name as stored in the files table (relative path or
+				archive-qualified name); defaults to the segment's base name
+		"""
+		columns = self._columns
+		columns['file'].append(filename or segment.file)
+		columns['key'].append(segment.key)
+		columns['offset'].append(segment.offset)
+		columns['words'].append(segment.words)
+		columns['text'].append(segment.text)
+		columns['band'].append(band)
+		columns['tm_match'].append(tm_match)
+		if len(columns['file']) >= self.batch_size:
+			self.flush()
+
+	def flush(self):
+		columns = self._columns
+		if not columns['file']:
+			return
+		table = pa.table({
+			'file': pa.array(columns['file'], pa.string()),
+			'key': pa.array(columns['key'], pa.string()),
+			'offset': pa.array(columns['offset'], pa.int64()),
+			'words': pa.array(columns['words'], pa.int32()),
+			'text': pa.array(columns['text'], pa.string()),
+			'band': pa.array(columns['band'], pa.string()),
+			'tm_match': pa.array(columns['tm_match'], pa.string()),
+		})
+		if self._writer is None:
+			os.makedirs(os.path.dirname(self.path), exist_ok=True)
+			self._writer = pq.ParquetWriter(self.path, table.schema)
+		self._writer.write_table(table)
+		self.rows += table.num_rows
+		self._reset()
+
+	def close(self):
+		self.flush()
+		if self._writer is not None:
+			self._writer.close()
+			self._writer = None
+
+
+class ResultStore:
+	"""Parquet-backed store of file, segment and QA tables, partitioned by project and run"""
+
+	def __init__(self, root=DEFAULT_STORE_ROOT, project='default'):
+		_require_pyarrow()
+		self.root = root
+		self.project = project
+
+	def _partition_path(self, table, run_id):
+		return os.path.join(self.root, table, f"project={self.project}", f"run={run_id}", 'part-0.parquet')
+
+	def _write(self, table, df, run_id, path=None):
+		path = path or self._partition_path(table, run_id)
+		os.makedirs(os.path.dirname(path), exist_ok=True)
+		pq.write_table(pa.Table.from_pandas(df, preserve_index=False), path)
+		return path
+
+	def segment_writer(self, run_id):
+		"""Return a SegmentWriter for the segments table of a run"""
+		return SegmentWriter(self._partition_path('segments', run_id))
+
+	def write_file_results(self, results, run_id):
+		"""Store counter results (list of dicts from count_words_in_file)"""
+		df = pd.DataFrame(results)
+		if 'bands' in df.columns:
+			bands = pd.DataFrame(df.pop('bands').tolist())
+			df = pd.concat([df, bands.add_prefix('band_')], axis=1)
+		if 'states' in df.columns:
+			# Only XLIFF files carry progress states
+			states = pd.DataFrame([s if isinstance(s, dict) else {} for s in df.pop('states')])
+			df = pd.concat([df, states.add_prefix('state_')], axis=1)
+		return self._write('files', df, run_id)
+
+	def write_qa_issues(self, report_list, run_id, locale=''):
+		"""Store QA issues (list of dicts from run_qa_audit)
+
+		Each write goes to its own part file under a locale partition, so auditing
+		several targets in one run keeps every locale's issues.
+		"""
+		df = pd.DataFrame(report_list, columns=['Key', 'Issue', 'Severity', 'Source', 'Target'])
+		df.columns = [column.lower() for column in df.columns]
+		# The locale column comes from the partition folder when the table is read
+		path = os.path.join(self.root, 'qa_issues', f"project={self.project}", f"run={run_id}",
+							f"locale={locale or 'unknown'}", f"part-{uuid.uuid4().hex}.parquet")
+		return self._write('qa_issues', df, run_id, path)
+
+	def load(self, table, runs=None, all_projects=False, columns=None):
+		"""Read a table into a DataFrame
+
+		Args:
+			table: 'files', 'segments' or 'qa_issues'
+			runs: Optional list of run ids to read (default: all runs)
+			all_projects: Read every project instead of this store's project
+			columns: Optional subset of columns to read
+		"""
+		path = os.path.join(self.root, table)
+		if not os.path.isdir(path):
+			return pd.DataFrame()
+
+		filters = []
+		if not all_projects:
+			filters.append(('project', '=', self.project))
+		if runs:
+			filters.append(('run', 'in', list(runs)))
+
+		df = pd.read_parquet(path, columns=columns, filters=filters or None)
+		for column in ('project', 'run', 'locale'):
+			if column in df.columns:
+				df[column] = df[column].astype(str)
+		return df
+
+	def runs(self):
+		"""List the run ids stored for this project, oldest first"""
+		path = os.path.join(self.root, 'files', f"project={self.project}")
+		if not os.path.isdir(path):
+			return []
+		return sorted(name.split('=', 1)[1] for name in os.listdir(path) if name.startswith('run='))
+
+	def words_by_file_type(self, run_id=None):
+		"""Total files and words per file type for one run (default: latest)"""
+		run_id = run_id or self.runs()[-1]
+		df = self.load('files', runs=[run_id], columns=['file_type', 'words'])
+		return (df.groupby('file_type', observed=True)['words']
+				.agg(files='count', words='sum')
+				.reset_index())
+
+	def cost_by_language(self, rate_table=None, run_id=None, languages=None):
+		"""Cost per target language for one run (default: latest), priced by CostEngine
+
+		Stored match bands, file types and XLIFF progress states are applied the same way
+		as in the counters.
+
+		Args:
+			rate_table: Dict from load_rate_table (default: rates.json)
+			languages: Optional subset of the rate table's languages
+		"""
+		# Lazy import: cost_engine needs numpy, which reading and writing results does not
+		from cost_engine import CostEngine, load_rate_table
+
+		run_id = run_id or self.runs()[-1]
+		df = self.load('files', runs=[run_id])
+		band_columns = [column for column in df.columns if column.startswith('band_')]
+		state_columns = [column for column in df.columns if column.startswith('state_')]
+
+		results = []
+		for row in df.to_dict('records'):
+			result = {'filename': row['filename'], 'file_type': row['file_type'], 'words': row['words']}
+			if band_columns:
+				result['bands'] = {column[len('band_'):]: row[column] for column in band_columns}
+			# Files without XLIFF states have NaN in the state columns
+			if state_columns and pd.notna(row.get('state_New')):
+				result['states'] = {column[len('state_'):]: row[column] for column in state_columns}
+			results.append(result)
+
+		engine = CostEngine(results, rate_table or load_rate_table())
+		return engine.costs_by_language(languages)
+
+	def run_trend(self, all_projects=False):
+		"""Files and words per run, for volume trends across runs"""
+		df = self.load('files', all_projects=all_projects, columns=['project', 'run', 'words'])
+		if df.empty:
+			return df
+		return (df.groupby(['project', 'run'], observed=True)['words']
+				.agg(files='count', words='sum')
+				.reset_index()
+				.sort_values(['project', 'run']))
+
+	def qa_summary(self, run_id=None):
+		"""Issue counts by severity and issue type for one run (default: all runs)"""
+		df = self.load('qa_issues', runs=[run_id] if run_id else None,
+					   columns=['run', 'severity', 'issue'])
+		if df.empty:
+			return df
+		return df.groupby(['run', 'severity', 'issue'], observed=True).size().reset_index(name='count')
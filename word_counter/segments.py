@@ -0,0 +1,725 @@
+"""
+Segment-level extraction for localization files
+
+Each extractor lazily yields Segment records (key, text, file, offset) instead of
+one joined text blob, so counters, repetition analysis, TM lookup and QA can all
+see string boundaries and keys while reading the file only once.
+
+Extractors accept a file path or an open file object (e.g. a Streamlit upload).
+Parse errors are raised to the caller.
+"""
+
+import io
+import os
+import re
+import json
+import mmap
+import hashlib
+import xml.etree.ElementTree as ET
+from contextlib import contextmanager
+
+
+class Segment:
+	"""One translatable string
+
+	Attributes:
+		key: String ID (JSON key path, XLIFF unit id, Android name, docx/pdf position)
+		text: Source text
+		file: Name of the file the segment came from
+		offset: Position of the segment within its file (0-based)
+	"""
+
+	__slots__ = ('key', 'text', 'file', 'offset')
+
+	def __init__(self, key, text, file, offset):
+		self.key = key
+		self.text = text
+		self.file = file
+		self.offset = offset
+
+	def __repr__(self):
+		return f"Segment(key={self.key!r}, text={self.text!r}, file={self.file!r}, offset={self.offset})"
+
+	@property
+	def words(self):
+		return len(self.text.split())
+
+
+def normalize_segment(text):
+	"""Collapse whitespace so formatting-only differences count as repeats"""
+	return ' '.join(text.split())
+
+
+def segment_hash(text):
+	"""Return a compact 8-byte hash of the normalized segment"""
+	return hashlib.blake2b(normalize_segment(text).encode('utf-8', 'surrogatepass'), digest_size=8).digest()
+
+
+def _file_name(source):
+	"""Return the base name of a path or file object"""
+	if isinstance(source, (str, os.PathLike)):
+		return os.path.basename(source)
+	return os.path.basename(getattr(source, 'name', ''))
+
+
+def _local_name(tag):
+	"""Strip the {namespace} prefix from an ElementTree tag"""
+	return tag.rsplit('}', 1)[-1]
+
+
+# JSON files above this size are read with the streaming parser
+STREAMING_JSON_THRESHOLD = 32 * 1024 * 1024
+
+# A JSON string (group 1, group 2 set when it is an object key) or a structural
+# character (group 3); numbers/true/false/null are skipped
+_JSON_TOKEN = re.compile(rb'("[^"\\]*(?:\\.[^"\\]*)*")(\s*:)?|([{}\[\],])')
+
+
+def _decode_json_string(token, errors='strict'):
+	"""Decode a quoted JSON string token (bytes, quotes included)"""
+	if b'\\' in token:
+		return json.loads(token.decode('utf-8', errors))
+	return token[1:-1].decode('utf-8', errors)
+
+
+def iter_json_segments(source, streaming=None, errors='strict'):
+	"""Yield every string value (not keys) of a JSON file, keyed by its path
+
+	Args:
+		source: File path or binary/text file object
+		streaming: Use the memory-mapped streaming parser; by default it is used
+			for files larger than STREAMING_JSON_THRESHOLD
+		errors: UTF-8 decoding error handler for file paths; 'surrogateescape' keeps
+			invalid bytes as lone surrogates (U+DC80-U+DCFF) instead of failing
+	"""
+	if isinstance(source, (str, os.PathLike)):
+		if streaming is None:
+			streaming = os.path.getsize(source) > STREAMING_JSON_THRESHOLD
+		if streaming:
+			yield from iter_json_segments_streaming(source, errors)
+			return
+		try:
+			with open(source, 'r', encoding='utf-8', errors=errors) as file:
+				data = json.load(file)
+		except RecursionError:
+			# json.load recurses once per nesting level (~1,000 levels); the token
+			# scanner keeps its own stack
+			yield from iter_json_segments_streaming(source, errors)
+			return
+	else:
+		try:
+			data = json.load(source)
+		except RecursionError:
+			source.seek(0)
+			raw = source.read()
+			yield from _scan_json_tokens(raw.encode('utf-8') if isinstance(raw, str) else raw,
+										 _file_name(source), errors)
+			return
+
+	filename = _file_name(source)
+	offset = 0
+
+	# json.load has already bounded the depth; an explicit stack keeps the walk from
+	# adding its own frames on top
+	stack = [('', data)]
+	while stack:
+		path, obj = stack.pop()
+		if isinstance(obj, dict):
+			stack.extend(reversed([(f"{path}.{key}" if path else str(key), value)
+								   for key, value in obj.items()]))
+		elif isinstance(obj, list):
+			stack.extend(reversed([(f"{path}[{idx}]", item) for idx, item in enumerate(obj)]))
+		elif isinstance(obj, str):
+			yield Segment(path, obj, filename, offset)
+			offset += 1
+
+
+def iter_json_segments_streaming(filepath, errors='strict'):
+	"""Yield string values of a JSON file without building the object tree
+
+	The file is memory-mapped and scanned token by token; only the current path
+	(one frame per open object/array) is kept in memory. The scanner assumes
+	well-formed JSON and does not validate it.
+	"""
+	filename = _file_name(filepath)
+
+	with open(filepath, 'rb') as file:
+		if os.fstat(file.fileno()).st_size == 0:
+			return
+		with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+			yield from _scan_json_tokens(data, filename, errors)
+
+
+def _scan_json_tokens(data, filename, errors='strict'):
+	"""Yield the string values of JSON bytes (or an mmap) token by token
+
+	Frames hold only the key or array index of each open container; a value's path
+	is joined when it is yielded, so memory stays linear in the nesting depth.
+	"""
+	# Frames: [is_object, current key or array index]
+	stack = []
+	offset = 0
+
+	def value_path():
+		parts = []
+		for is_object, key in stack:
+			if not is_object:
+				parts.append(f"[{key}]")
+			elif len(parts) > 1 or parts and parts[0]:
+				parts.append(f".{key}")
+			else:
+				parts.append(key)
+		return ''.join(parts)
+
+	for match in _JSON_TOKEN.finditer(data):
+		string, colon, char = match.groups()
+		if string:
+			if colon:
+				stack[-1][1] = _decode_json_string(string, errors)
+			else:
+				yield Segment(value_path(), _decode_json_string(string, errors), filename, offset)
+				offset += 1
+		elif char == b',':
+			if stack and not stack[-1][0]:
+				stack[-1][1] += 1
+		elif char == b'{':
+			stack.append([True, None])
+		elif char == b'[':
+			stack.append([False, 0])
+		else:
+			stack.pop()
+
+
+# XLIFF elements holding a copy of the source that must not be counted again:
+# 1.2 alt-trans (TM matches) and seg-source (segmented copy), 2.0 ignorable
+_XLIFF_SKIPPED = ('alt-trans', 'seg-source', 'ignorable')
+_XLIFF_UNITS = ('trans-unit', 'unit', 'segment')
+_XML_LANG = '{http://www.w3.org/XML/1998/namespace}lang'
+
+# Translation progress buckets for XLIFF units, in report order
+XLIFF_STATES = ['New', 'Translated', 'Approved', 'Locked']
+
+# 1.2 <target state> and 2.0 <segment state> values; unknown states with a target
+# count as Translated
+_XLIFF_STATE_BUCKETS = {
+	'new': 'New',
+	'initial': 'New',
+	'needs-translation': 'New',
+	'needs-l10n': 'New',
+	'needs-adaptation': 'New',
+	'translated': 'Translated',
+	'needs-review-translation': 'Translated',
+	'needs-review-l10n': 'Translated',
+	'needs-review-adaptation': 'Translated',
+	'reviewed': 'Approved',
+	'signed-off': 'Approved',
+	'final': 'Approved',
+}
+
+# <note category> (2.0) or <note from> (1.2) values that lock a unit
+LOCK_NOTE_CATEGORIES = ('locked', 'lock', 'do-not-translate', 'dnt')
+
+# XLIFF 1.2/TMX inline elements whose content is native markup, not text
+_INLINE_CODES = ('bpt', 'ept', 'ph', 'it', 'ut')
+
+# Android string resource escapes: \' \" \n \t \@ \? \\ and \uXXXX
+_ANDROID_ESCAPE = re.compile(r"\\(u[0-9a-fA-F]{4}|.)")
+
+
+def _inline_text(elem):
+	parts = [elem.text or '']
+	for child in elem:
+		if _local_name(child.tag) not in _INLINE_CODES:
+			parts.append(_inline_text(child))
+		parts.append(child.tail or '')
+	return ''.join(parts)
+
+
+def _element_text(elem):
+	"""Return the text inside an element, including inline children (<g>, <pc>, <xliff:g>)
+	but not native codes (<bpt>, <ept>, <ph>, <it>, <ut>)"""
+	return _inline_text(elem).strip()
+
+
+def _xliff_state(unit, translatable, locked, target_text, target_state):
+	"""Progress bucket of a 1.2 trans-unit or 2.0 segment"""
+	if not translatable or locked:
+		return 'Locked'
+	if not target_text:
+		return 'New'
+	if unit.get('approved') == 'yes':
+		return 'Approved'
+	# 1.2 keeps the state on <target>, 2.0 on <segment>
+	state = (target_state or unit.get('state') or '').lower()
+	return _XLIFF_STATE_BUCKETS.get(state, 'Translated')
+
+
+def _position_key(offset):
+	"""Key of a unit without an id; '#' keeps it apart from numeric ids like '3'"""
+	return f"#{offset}"
+
+
+def _iter_xliff_segments(events, root, filename):
+	"""(Segment, state) for the <source> text of XLIFF 1.2 trans-units and 2.0 unit/segments
+
+	Segments are keyed by unit ids (or '#<offset>') and yielded when their trans-unit (1.2) or
+	segment (2.0) closes, once its target, state, translate flag and notes are known.
+	"""
+	offset = 0
+	unit_ids = []
+	parents = [root]
+	translatable = [root.get('translate') != 'no']
+	skip_depth = 0
+	sources = []
+	target_text = target_state = None
+	locked = False
+
+	for event, elem in events:
+		tag = _local_name(elem.tag).lower()
+
+		if event == 'start':
+			parents.append(elem)
+			# translate="no" on file/group/unit is inherited
+			translatable.append(translatable[-1] and elem.get('translate') != 'no')
+			if tag in _XLIFF_UNITS:
+				unit_ids.append(elem.get('id', ''))
+				if tag != 'segment':
+					locked = False
+			elif tag in _XLIFF_SKIPPED:
+				skip_depth += 1
+			continue
+
+		parents.pop()
+		is_translatable = translatable.pop()
+		if tag in _XLIFF_SKIPPED:
+			skip_depth -= 1
+		elif skip_depth:
+			continue
+		elif tag == 'source':
+			text = _element_text(elem)
+			if text:
+				sources.append(text)
+		elif tag == 'target':
+			target_text = _element_text(elem)
+			target_state = elem.get('state')
+		elif tag == 'note':
+			category = elem.get('category') or elem.get('from') or ''
+			if category.lower() in LOCK_NOTE_CATEGORIES:
+				locked = True
+		elif tag in _XLIFF_UNITS:
+			if sources:
+				state = _xliff_state(elem, is_translatable, locked, target_text, target_state)
+				key = '/'.join(uid for uid in unit_ids if uid) or _position_key(offset)
+				for text in sources:
+					yield Segment(key, text, filename, offset), state
+					offset += 1
+				sources = []
+			target_text = target_state = None
+			unit_ids.pop()
+			# Earlier siblings are finished too, so dropping them keeps memory flat
+			if parents:
+				del parents[-1][:]
+
+
+def _iter_tmx_segments(events, root, filename):
+	"""<seg> text of each <tu>'s source-language <tuv>, keyed by tuid (or '#<offset>')"""
+	src_lang = ''
+	offset = 0
+	parents = [root]
+
+	for event, elem in events:
+		tag = _local_name(elem.tag).lower()
+
+		if event == 'start':
+			parents.append(elem)
+			if tag == 'header':
+				src_lang = elem.get('srclang', '').lower()
+				if src_lang == '*all*':
+					src_lang = ''
+			continue
+
+		parents.pop()
+		if tag != 'tu':
+			continue
+
+		variants = elem.findall('{*}tuv')
+		source_tuv = None
+		for tuv in variants:
+			lang = (tuv.get(_XML_LANG) or tuv.get('lang') or '').lower()
+			if src_lang and (lang == src_lang or lang.split('-')[0] == src_lang.split('-')[0]):
+				source_tuv = tuv
+				break
+		if source_tuv is None and variants:
+			source_tuv = variants[0]
+
+		seg = source_tuv.find('{*}seg') if source_tuv is not None else None
+		if seg is not None:
+			text = _element_text(seg)
+			if text:
+				yield Segment(elem.get('tuid') or _position_key(offset), text, filename, offset)
+				offset += 1
+		if parents:
+			del parents[-1][:]
+
+
+def _android_unescape(text):
+	def replace(match):
+		escape = match.group(1)
+		if escape[0] == 'u' and len(escape) == 5:
+			return chr(int(escape[1:], 16))
+		return {'n': '\n', 't': '\t'}.get(escape, escape)
+
+	# Unescaped double quotes only delimit whitespace-preserving runs
+	return _ANDROID_ESCAPE.sub(replace, text.replace('\\"', '\x00')).replace('"', '').replace('\x00', '"')
+
+
+def _iter_android_segments(events, root, filename):
+	"""Android strings.xml: <string>, <string-array> items and <plurals> items
+
+	Keys: name, name[index] for array items, name:quantity for plurals.
+	translatable="false" resources and @string/... references are skipped.
+	"""
+	offset = 0
+	depth = 0
+
+	for event, elem in events:
+		if event == 'start':
+			depth += 1
+			continue
+		depth -= 1
+		if depth:
+			# Items and inline <xliff:g> are read when their resource closes
+			continue
+
+		tag = _local_name(elem.tag)
+		name = elem.get('name', '')
+		entries = []
+		if elem.get('translatable') == 'false':
+			pass
+		elif tag == 'string':
+			entries.append((name, elem))
+		elif tag == 'string-array':
+			entries.extend((f"{name}[{index}]", item) for index, item in enumerate(elem))
+		elif tag == 'plurals':
+			entries.extend((f"{name}:{item.get('quantity', '')}", item) for item in elem)
+
+		for key, entry in entries:
+			text = _android_unescape(_element_text(entry)).strip()
+			if text and not text.startswith(('@', '?')):
+				yield Segment(key, text, filename, offset)
+				offset += 1
+		root.remove(elem)
+
+
+def _xml_label(elem):
+	"""Path label of an element with a name/id/key attribute (product[001]), else None"""
+	xml_id = elem.get('name') or elem.get('id') or elem.get('key')
+	return f"{_local_name(elem.tag)}[{xml_id}]" if xml_id else None
+
+
+def _xml_key(elem, ancestor_labels):
+	"""Element's name/id/key attribute (or tag), qualified with its ancestors' ids"""
+	own = elem.get('name') or elem.get('id') or elem.get('key') or _local_name(elem.tag).lower()
+	return '/'.join([label for label in ancestor_labels if label] + [own])
+
+
+def _iter_generic_xml_segments(events, root, filename):
+	"""All element text and tails, keyed by the element's name/id/key attribute or tag
+
+	Keys are qualified with the ids of their ancestors (product[001]/name), so
+	repeated child tags stay distinct when entries are inserted or reordered.
+	"""
+	offset = 0
+	# Labels of the open elements, root first
+	labels = [_xml_label(root)]
+
+	for event, elem in events:
+		if event == 'start':
+			labels.append(_xml_label(elem))
+			continue
+
+		label = labels.pop()
+		if elem.text and elem.text.strip():
+			yield Segment(_xml_key(elem, labels), elem.text.strip(), filename, offset)
+			offset += 1
+
+		# Tails are only complete once the parent closes
+		for child in elem:
+			if child.tail and child.tail.strip():
+				yield Segment(_xml_key(child, labels + [label]), child.tail.strip(), filename, offset)
+				offset += 1
+		del elem[:]
+
+
+def iter_xml_segments(source):
+	"""Yield text segments from an XML-based file, in a single streaming pass
+
+	The root element picks the dialect:
+	- XLIFF 1.2 / 2.0: only <source> text, keyed by trans-unit/unit/segment ids
+	- TMX: source-language <tuv> text of each <tu>, keyed by tuid
+	- Android strings.xml (<resources>): strings, string-array and plurals items
+	- Other XML: all element text and tails, keyed by the element's name/id attribute
+	  or tag under its ancestors' ids (product[001]/name)
+	"""
+	filename = _file_name(source)
+	events = ET.iterparse(source, events=('start', 'end'))
+	_, root = next(events)
+	root_tag = _local_name(root.tag).lower()
+
+	if 'xliff' in root_tag:
+		for segment, _ in _iter_xliff_segments(events, root, filename):
+			yield segment
+	elif root_tag == 'tmx':
+		yield from _iter_tmx_segments(events, root, filename)
+	elif root_tag == 'resources':
+		yield from _iter_android_segments(events, root, filename)
+	else:
+		yield from _iter_generic_xml_segments(events, root, filename)
+
+
+def iter_xliff_segment_states(source):
+	"""Yield (Segment, state) for every source segment of an XLIFF 1.2/2.0 file
+
+	State is one of XLIFF_STATES, read in the same pass from <target state>,
+	approved="yes", translate="no" and lock notes.
+	"""
+	filename = _file_name(source)
+	events = ET.iterparse(source, events=('start', 'end'))
+	_, root = next(events)
+	if 'xliff' not in _local_name(root.tag).lower():
+		raise ValueError(f"Not an XLIFF file: {filename}")
+	yield from _iter_xliff_segments(events, root, filename)
+
+
+def iter_docx_segments(source):
+	"""Yield paragraphs and table cells of a Word document"""
+	from docx import Document  # Imported here so JSON/XML users don't need python-docx
+
+	filename = _file_name(source)
+	doc = Document(source)
+	offset = 0
+
+	for idx, paragraph in enumerate(doc.paragraphs):
+		if paragraph.text.strip():
+			yield Segment(f"p{idx}", paragraph.text, filename, offset)
+			offset += 1
+
+	for t_idx, table in enumerate(doc.tables):
+		for r_idx, row in enumerate(table.rows):
+			for c_idx, cell in enumerate(row.cells):
+				if cell.text.strip():
+					yield Segment(f"t{t_idx}.r{r_idx}.c{c_idx}", cell.text, filename, offset)
+					offset += 1
+
+
+def iter_pdf_segments(source, on_page=None):
+	"""Yield the text of each PDF page
+
+	Args:
+		source: File path or binary file object
+		on_page: Optional callback(page number, page count) called after each page
+	"""
+	import PyPDF2  # Imported here so JSON/XML users don't need PyPDF2
+
+	filename = _file_name(source)
+
+	if isinstance(source, (str, os.PathLike)):
+		with open(source, 'rb') as file:
+			yield from iter_pdf_segments(file, on_page)
+		return
+
+	pdf_reader = PyPDF2.PdfReader(source)
+	page_count = len(pdf_reader.pages)
+	offset = 0
+	for page_num, page in enumerate(pdf_reader.pages):
+		page_text = page.extract_text()
+		if on_page is not None:
+			on_page(page_num + 1, page_count)
+		if page_text and page_text.strip():
+			yield Segment(f"page{page_num + 1}", page_text, filename, offset)
+			offset += 1
+
+
+@contextmanager
+def _open_text(source, encoding='utf-8-sig'):
+	"""Open a path, or wrap a binary file object, as a text stream"""
+	if isinstance(source, (str, os.PathLike)):
+		with open(source, 'r', encoding=encoding) as file:
+			yield file
+	elif isinstance(source, io.TextIOBase):
+		yield source
+	else:
+		wrapper = io.TextIOWrapper(source, encoding=encoding)
+		try:
+			yield wrapper
+		finally:
+			# Leave the caller's stream open
+			wrapper.detach()
+
+
+_PO_ESCAPES = {'n': '\n', 't': '\t', 'r': '\r', '"': '"', '\\': '\\'}
+_PO_ESCAPE = re.compile(r'\\(.)')
+
+
+def _po_string(line):
+	"""Decode the quoted string at the end of a PO line"""
+	quoted = line[line.index('"') + 1:line.rindex('"')]
+	return _PO_ESCAPE.sub(lambda m: _PO_ESCAPES.get(m.group(1), m.group(1)), quoted)
+
+
+def iter_po_segments(source):
+	"""Yield msgid (and msgid_plural) text of a gettext PO/POT file, line by line
+
+	Keys are the msgid, prefixed with 'msgctxt|' when the entry has a context.
+	The header entry (empty msgid) and obsolete '#~' entries are skipped.
+	"""
+	filename = _file_name(source)
+	offset = 0
+	entry = {}
+	field = None
+
+	def finish():
+		nonlocal offset
+		msgid = entry.get('msgid')
+		if msgid:
+			key = f"{entry['msgctxt']}|{msgid}" if 'msgctxt' in entry else msgid
+			yield Segment(key, msgid, filename, offset)
+			offset += 1
+			if entry.get('msgid_plural'):
+				yield Segment(key + '[plural]', entry['msgid_plural'], filename, offset)
+				offset += 1
+		entry.clear()
+
+	with _open_text(source) as lines:
+		for line in lines:
+			line = line.strip()
+			if not line or line.startswith('#'):
+				continue
+			if line.startswith('"'):
+				if field in ('msgctxt', 'msgid', 'msgid_plural'):
+					entry[field] += _po_string(line)
+				continue
+
+			keyword = line.split(None, 1)[0]
+			if keyword in ('msgctxt', 'msgid'):
+				# msgctxt, or msgid without one, starts a new entry
+				if keyword == 'msgctxt' or 'msgctxt' not in entry or 'msgid' in entry:
+					yield from finish()
+			field = keyword if keyword in ('msgctxt', 'msgid', 'msgid_plural') else None
+			if field:
+				entry[field] = _po_string(line)
+	yield from finish()
+
+
+# "key" = "value"; entries of an Apple .strings file, skipping /* */ and // comments
+_APPLE_STRINGS_TOKEN = re.compile(
+	r'/\*.*?\*/|//[^\n]*|"((?:[^"\\]|\\.)*)"\s*=\s*"((?:[^"\\]|\\.)*)"\s*;', re.DOTALL)
+_APPLE_ESCAPE = re.compile(r'\\(U[0-9a-fA-F]{4}|u[0-9a-fA-F]{4}|.)')
+
+
+def _apple_unescape(text):
+	def replace(match):
+		escape = match.group(1)
+		if len(escape) == 5:
+			return chr(int(escape[1:], 16))
+		return {'n': '\n', 't': '\t', 'r': '\r'}.get(escape, escape)
+	return _APPLE_ESCAPE.sub(replace, text)
+
+
+def iter_apple_strings_segments(source):
+	"""Yield the values of an iOS/macOS .strings file, keyed by their string keys
+
+	.strings files are small and may be UTF-16 (legacy Xcode output), so the file
+	is decoded whole before scanning.
+	"""
+	filename = _file_name(source)
+	if isinstance(source, (str, os.PathLike)):
+		with open(source, 'rb') as file:
+			data = file.read()
+	else:
+		data = source.read()
+
+	if isinstance(data, bytes):
+		encoding = 'utf-16' if data[:2] in (b'\xff\xfe', b'\xfe\xff') else 'utf-8-sig'
+		data = data.decode(encoding)
+
+	offset = 0
+	for match in _APPLE_STRINGS_TOKEN.finditer(data):
+		if match.group(1) is None:
+			continue
+		text = _apple_unescape(match.group(2)).strip()
+		if text:
+			yield Segment(_apple_unescape(match.group(1)), text, filename, offset)
+			offset += 1
+
+
+def _xcstrings_values(localization, key):
+	"""Yield (key, value) for a string catalog localization, including plural/device variations"""
+	unit = localization.get('stringUnit')
+	if unit is not None:
+		yield key, unit.get('value', '')
+	for variation_type, variations in localization.get('variations', {}).items():
+		for case, variation in variations.items():
+			yield from _xcstrings_values(variation, f"{key}:{variation_type}.{case}")
+	for name, substitution in localization.get('substitutions', {}).items():
+		yield from _xcstrings_values(substitution, f"{key}:{name}")
+
+
+def iter_xcstrings_segments(source):
+	"""Yield source-language text of an Xcode string catalog (.xcstrings)
+
+	Strings without a source localization use their key as source text, as Xcode
+	does. shouldTranslate=false strings are skipped.
+	"""
+	filename = _file_name(source)
+	if isinstance(source, (str, os.PathLike)):
+		with open(source, 'r', encoding='utf-8-sig') as file:
+			catalog = json.load(file)
+	else:
+		catalog = json.load(source)
+
+	source_language = catalog.get('sourceLanguage', 'en')
+	offset = 0
+	for key, entry in catalog.get('strings', {}).items():
+		if entry.get('shouldTranslate') is False:
+			continue
+		localization = entry.get('localizations', {}).get(source_language)
+		values = list(_xcstrings_values(localization, key)) if localization else [(key, key)]
+		for value_key, text in values:
+			if text.strip():
+				yield Segment(value_key, text, filename, offset)
+				offset += 1
+
+
+# Extension -> (file type label, extractor)
+SEGMENT_READERS = {
+	'.json': ('JSON', iter_json_segments),
+	'.xml': ('XML/XLF', iter_xml_segments),
+	'.xlf': ('XML/XLF', iter_xml_segments),
+	'.xliff': ('XML/XLF', iter_xml_segments),
+	'.tmx': ('TMX', iter_xml_segments),
+	'.po': ('PO', iter_po_segments),
+	'.pot': ('PO', iter_po_segments),
+	'.strings': ('STRINGS', iter_apple_strings_segments),
+	'.xcstrings': ('XCSTRINGS', iter_xcstrings_segments),
+	'.docx': ('DOCX', iter_docx_segments),
+	'.pdf': ('PDF', iter_pdf_segments),
+}
+
+
+# Glob patterns for every supported extension, e.g. for walk_files
+SUPPORTED_PATTERNS = ['*' + ext for ext in SEGMENT_READERS]
+
+
+def get_reader(filename):
+	"""Return (file type, extractor) for a file name, or None if unsupported"""
+	_, ext = os.path.splitext(filename)
+	return SEGMENT_READERS.get(ext.lower())
+
+
+def iter_segments(source):
+	"""Yield segments from any supported file, dispatching on its extension"""
+	reader = get_reader(_file_name(source))
+	if reader is None:
+		raise ValueError(f"Unsupported file type: {_file_name(source)}")
+	return reader[1](source)
@@ -1,35 +1,47 @@
 """
 Features:
-- Multi-format support (JSON, XML, XLF, DOCX, PDF)
+- Multi-format support (JSON, XML, XLF/XLIFF, TMX, PO/POT, iOS strings, DOCX, PDF)
 - Language-specific cost calculation (by Reading a rate.json data)
+- Repetition and fuzzy-match analysis (banded word counts)
 - Excel export
 - Configurable rates
+- Optional offload to the local count service (count_service.py)
+- Uploads parsed on a worker pool with per-file and per-page (PDF) progress;
+  at most 2 uploads per worker are parsed or waiting to be tallied at a time.
+  Large JSON uploads are copied to a temp file so they are scanned from a
+  memory map instead of loaded with json.load; other formats stream from the
+  upload itself. Streamlit keeps every upload's bytes in memory, and the
+  per-file counts stay in the session.
 """
 
 import streamlit as st
-import os
-import json
-import xml.etree.ElementTree as ET
-from docx import Document
-import PyPDF2
 import pandas as pd
 from datetime import datetime
 import io
-import json
-
-# CONFIGURATION - Edit rates here
+import os
+import queue
+import shutil
+import tempfile
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from repetition_analyzer import RepetitionAnalyzer, MATCH_BANDS, weighted_word_count
+from cost_engine import CostEngine, load_rate_table, format_cost
+from segments import SEGMENT_READERS, get_reader
+from count_service import submit_job, wait_for_job, encode_upload
+
+# CONFIGURATION - Edit rates in rates.json
 # ============================================================================
-LANGUAGE_RATES = {
-	'English (EN)': 0.16,
-    'French (FR)': 0.16,
-    'German (DE)': 0.16,
-    'Spanish (ES)': 0.14,
-    'Japanese (JA)': 0.20,
-    'Simplified Chinese (zh-CN)': 0.11,
-}
+RATE_TABLE = load_rate_table()
+LANGUAGE_RATES = RATE_TABLE['languages']
+CURRENCY = RATE_TABLE['currency']
 
 SOURCE_LANGUAGE = 'Korean (KO)'
 
+# Upload processing
+UPLOAD_WORKERS = 4
+TEMPFILE_THRESHOLD = 50 * 1024 * 1024  # Larger uploads of TEMPFILE_FORMATS are parsed from a temp file
+TEMPFILE_FORMATS = ('JSON',)  # Only JSON reads differently (memory-mapped) from a path
+
 # Page Configuration
 # ============================================================================
 
@@ -42,140 +54,162 @@ st.set_page_config(
 # Helper Functions
 # ============================================================================
 
-def extract_text_from_json(file):
-
-	def get_strings(obj):
-		text = []
-		if isinstance(obj, dict):
-			for value in obj.values():
-				text.extend(get_strings(value))
-		elif isinstance(obj, list):
-			for item in obj:
-				text.extend(get_strings(item))
-		elif isinstance(obj, str):
-			text.append(obj)
-		return text
-
-	try:
-		data = json.load(file)
-		all_text = get_strings(data)
-		return ' '.join(all_text)
-	except Exception as e:
-		st.error(f"Error reading JSON: {e}")
-		return ""
-
-
-def extract_text_from_xml(file):
-
+def upload_to_tempfile(file):
+	"""Copy an upload to a temp file and return its path, so a big JSON is scanned by the
+	memory-mapped streaming reader instead of building the whole tree with json.load"""
+	_, ext = os.path.splitext(file.name)
+	file.seek(0)
+	with tempfile.NamedTemporaryFile(suffix=ext, delete=False) as temp_file:
+		shutil.copyfileobj(file, temp_file, 1024 * 1024)
+	return temp_file.name
+
+def extract_upload(file, events):
+	"""Parse one upload into segments (runs on the worker pool)
+
+	Args:
+		file: Streamlit UploadedFile
+		events: Queue receiving (file name, page, page count) as PDF pages are read
+
+	Returns:
+		(file type, list of Segment), or (file type, error message string)
+	"""
+	file_type, iter_file_segments = get_reader(file.name)
+	source = file
+	temp_path = None
 	try:
-		tree = ET.parse(file)
-		root = tree.getroot()
-		text = []
-
-		# Check if XLF (only extract source)
-		is_xlf = file.name.lower().endswith('.xlf')
-
-		if is_xlf:
-			for elem in root.iter():
-				if 'source' in elem.tag.lower():
-					if elem.text and elem.text.strip():
-						text.append(elem.text.strip())
+		if file_type in TEMPFILE_FORMATS and file.size > TEMPFILE_THRESHOLD:
+			temp_path = upload_to_tempfile(file)
+			source = temp_path
 		else:
-			for elem in root.iter():
-				if elem.text and elem.text.strip():
-					text.append(elem.text.strip())
-
-		return ' '.join(text)
-	except Exception as e:
-		st.error(f"Error reading XML: {e}")
-		return ""
-
-
-def extract_text_from_docx(file):
-
-	try:
-		doc = Document(file)
-		text = []
-
-		for paragraph in doc.paragraphs:
-			if paragraph.text.strip():
-				text.append(paragraph.text)
-
-		for table in doc.tables:
-			for row in table.rows:
-				for cell in row.cells:
-					if cell.text.strip():
-						text.append(cell.text)
-
-		return ' '.join(text)
-	except Exception as e:
-		st.error(f"Error reading DOCX: {e}")
-		return ""
-
-
-def extract_text_from_pdf(file):
-
-	try:
-		pdf = PyPDF2.PdfReader(file)
-		text = []
-
-		for page in pdf.pages:
-			page_text = page.extract_text()
-			if page_text:
-				text.append(page_text)
-
-		return ' '.join(text)
+			file.seek(0)
+		if file_type == 'PDF':
+			segments = iter_file_segments(source, on_page=lambda page, pages: events.put((file.name, page, pages)))
+		else:
+			segments = iter_file_segments(source)
+		return file_type, list(segments)
 	except Exception as e:
-		st.error(f"Error reading PDF: {e}")
-		return ""
-
-
-def count_words_in_file(file):
-
-	filename = file.name
-	_, ext = os.path.splitext(filename)
-	ext = ext.lower()
-
-	if ext == '.json':
-		text = extract_text_from_json(file)
-		file_type = 'JSON'
-	elif ext in ['.xml', '.xlf']:
-		text = extract_text_from_xml(file)
-		file_type = 'XML/XLF'
-	elif ext == '.docx':
-		text = extract_text_from_docx(file)
-		file_type = 'DOCX'
-	elif ext == '.pdf':
-		text = extract_text_from_pdf(file)
-		file_type = 'PDF'
-	else:
-		st.warning(f"⚠️ Unsupported file type: {filename}")
-		return None
-
-	words = len(text.split()) if text else 0
-
-	return {
+		return file_type, str(e)
+	finally:
+		if temp_path:
+			os.remove(temp_path)
+
+def tally_upload(filename, file_type, segments, analyzer=None):
+	"""Build the result row for a parsed upload"""
+	words = 0
+	bands = dict.fromkeys(MATCH_BANDS, 0)
+	if isinstance(segments, str):
+		st.error(f"Error reading {file_type} ({filename}): {segments}")
+		segments = []
+
+	for segment in segments:
+		segment_words = segment.words
+		if not segment_words:
+			continue
+		words += segment_words
+		if analyzer is not None:
+			bands[analyzer.add_segment(segment.text)] += segment_words
+
+	result = {
 		'filename': filename,
 		'file_type': file_type,
 		'words': words
 	}
+	if analyzer is not None:
+		result.update(bands)
+		result['weighted_words'] = round(weighted_word_count(bands, RATE_TABLE['band_weights']), 1)
+	return result
+
+def count_uploads(files, analyzer=None, on_progress=None, on_result=None):
+	"""Count uploads on a worker pool
+
+	Files are parsed concurrently but tallied in upload order, so repetition bands
+	match a sequential run.
+
+	Args:
+		on_progress: Optional callback(fraction done, status message)
+		on_result: Optional callback(results so far), called as each file is tallied
+	"""
+	results = []
+	supported = []
+	for file in files:
+		if get_reader(file.name) is None:
+			st.warning(f"⚠️ Unsupported file type: {file.name}")
+		else:
+			supported.append(file)
+	if not supported:
+		return results
+
+	events = queue.Queue()
+	pages = {}
+	finished = 0
+	with ThreadPoolExecutor(max_workers=UPLOAD_WORKERS) as executor:
+		# Bounded window: parsed segments are held for at most UPLOAD_WORKERS * 2 files
+		upcoming = iter(supported)
+		pending = deque()
+		while True:
+			while len(pending) < UPLOAD_WORKERS * 2:
+				file = next(upcoming, None)
+				if file is None:
+					break
+				pending.append((file, executor.submit(extract_upload, file, events)))
+			if not pending:
+				break
+
+			try:
+				name, page, page_count = events.get(timeout=0.1)
+				pages[name] = (page, page_count)
+			except queue.Empty:
+				pass
+
+			# Tally every finished file at the front of the window, in upload order
+			while pending and pending[0][1].done():
+				file, future = pending.popleft()
+				results.append(tally_upload(file.name, *future.result(), analyzer))
+				pages.pop(file.name, None)
+				finished += 1
+				if on_result:
+					on_result(results)
+
+			if on_progress:
+				done = finished + sum(future.done() for _, future in pending)
+				in_progress = {name: progress for name, progress in pages.items() if progress[0] < progress[1]}
+				partial = sum(page / page_count for page, page_count in in_progress.values())
+				status = f"Processed {done}/{len(supported)} files"
+				for name, (page, page_count) in in_progress.items():
+					status += f" | {name}: page {page}/{page_count}"
+				on_progress(min((done + partial) / len(supported), 1.0), status)
+	return results
+
+def count_with_service(files, service_url, analyze_repetitions, on_progress=None):
+	"""Count uploaded files on the local count service
+
+	Returns results in the same shape as tally_upload.
+	"""
+	payload = {
+		'type': 'count',
+		'repetitions': analyze_repetitions,
+		'files': [encode_upload(file.name, file.getvalue()) for file in files],
+	}
+	response = wait_for_job(submit_job(payload, service_url), service_url, on_progress=on_progress)
+	for name in response['errors']:
+		st.warning(f"⚠️ Could not count: {name}")
 
+	results = response['results']
+	for result in results:
+		if 'bands' in result:
+			bands = result.pop('bands')
+			result.update(bands)
+			result['weighted_words'] = round(weighted_word_count(bands, RATE_TABLE['band_weights']), 1)
+	return results
 
-def calculate_costs(word_count, selected_languages, rates):
-
-	costs = {}
-	total = 0
 
-	for lang in selected_languages:
-		rate = rates[lang]
-		cost = word_count * rate
-		costs[lang] = cost
-		total += cost
+def calculate_costs(engine, selected_languages):
 
-	return costs, total
+	df_costs = engine.costs_by_language(selected_languages)
+	return df_costs, df_costs[engine.cost_column].sum()
 
 
-def create_excel_report(file_results, selected_languages, language_costs, total_words):
+def create_excel_report(file_results, selected_languages, engine):
 	"""Create Excel report with multiple sheets"""
 
 	# Create Excel writer object in memory
@@ -186,63 +220,68 @@ def create_excel_report(file_results, selected_languages, language_costs, total_
 		# Sheet 1: File Analysis
 		file_data = []
 		for result in file_results:
-			file_data.append({
+			row = {
 				'File Name': result['filename'],
 				'Type': result['file_type'],
 				'Words': result['words']
-			})
+			}
+			if 'weighted_words' in result:
+				for band in MATCH_BANDS:
+					row[band] = result[band]
+				row['Weighted Words'] = result['weighted_words']
+			file_data.append(row)
 
 		df_files = pd.DataFrame(file_data)
 
 		# Add totals row
-		totals_row = {
-			'File Name': 'TOTAL',
-			'Type': '',
-			'Words': df_files['Words'].sum()
-		}
+		totals_row = {column: df_files[column].sum() for column in df_files.columns
+					  if column not in ('File Name', 'Type')}
+		totals_row.update({'File Name': 'TOTAL', 'Type': ''})
 		df_files = pd.concat([df_files, pd.DataFrame([totals_row])], ignore_index=True)
 
 		df_files.to_excel(writer, sheet_name='File Analysis', index=False)
 
 		# Sheet 2: Cost by Language
-		cost_data = []
-		for lang, cost in language_costs.items():
-			cost_data.append({
-				'Target Language': lang,
-				'Rate (USD/word)': LANGUAGE_RATES[lang],
-				'Source Words': total_words,
-				'Total Cost (USD)': round(cost, 2)
-			})
-
-		df_costs = pd.DataFrame(cost_data)
+		df_costs = engine.costs_by_language(selected_languages)
+		total_cost = df_costs[engine.cost_column].sum()
 
 		# Add totals
 		cost_totals = {
 			'Target Language': 'TOTAL',
-			'Rate (USD/word)': '',
+			engine.rate_column: '',
 			'Source Words': '',
-			'Total Cost (USD)': df_costs['Total Cost (USD)'].sum()
+			'Billable Words': '',
+			engine.cost_column: total_cost
 		}
 		df_costs = pd.concat([df_costs, pd.DataFrame([cost_totals])], ignore_index=True)
 
 		df_costs.to_excel(writer, sheet_name='Cost by Language', index=False)
 
-		# Sheet 3: Summary
+		# Sheet 3: File x language cost matrix
+		df_file_costs = engine.costs_by_file(selected_languages)
+		file_cost_totals = df_file_costs.drop(columns=['File Name', 'Type']).sum().round(2).to_dict()
+		file_cost_totals.update({'File Name': 'TOTAL', 'Type': ''})
+		df_file_costs = pd.concat([df_file_costs, pd.DataFrame([file_cost_totals])], ignore_index=True)
+		df_file_costs.to_excel(writer, sheet_name='Cost by File', index=False)
+
+		# Sheet 4: Summary
 		summary_data = {
 			'Metric': [
 				'Source Language',
 				'Total Files',
 				'Total Words',
+				'Billable Words',
 				'Target Languages',
-				'Total Cost (USD)',
+				engine.cost_column,
 				'Report Date'
 			],
 			'Value': [
 				SOURCE_LANGUAGE,
 				len(file_results),
-				total_words,
+				sum(result['words'] for result in file_results),
+				round(engine.weighted_words.sum(), 1),
 				', '.join(selected_languages),
-				f"${sum(language_costs.values()):,.2f}",
+				format_cost(total_cost, engine.currency),
 				datetime.now().strftime('%Y-%m-%d %H:%M:%S')
 			]
 		}
@@ -289,47 +328,102 @@ with st.sidebar:
 
 	st.markdown("---")
 
-	st.subheader("💰 Current Rates (USD/word)")
+	st.subheader(f"💰 Current Rates ({CURRENCY}/word)")
 	for lang, rate in LANGUAGE_RATES.items():
 		if lang in selected_languages:
-			st.markdown(f"**{lang}**: ${rate:.2f}")
+			st.markdown(f"**{lang}**: {format_cost(rate, CURRENCY)}")
 		else:
-			st.markdown(f"{lang}: ${rate:.2f}")
+			st.markdown(f"{lang}: {format_cost(rate, CURRENCY)}")
+
+	st.markdown("---")
+
+	st.subheader("🔁 Match Analysis")
+	analyze_repetitions = st.checkbox(
+		"Discount repetitions and fuzzy matches",
+		value=True,
+		help="Words in repeated or similar segments are charged at reduced rates"
+	)
+	if analyze_repetitions:
+		for band in MATCH_BANDS:
+			st.markdown(f"{band}: {RATE_TABLE['band_weights'][band]:.0%}")
 
 	st.markdown("---")
-	st.caption("💡 Tip: Edit rates in the script's LANGUAGE_RATES dictionary")
+
+	st.subheader("🖥️ Count Service")
+	service_url = st.text_input(
+		"Service URL (optional)",
+		value="",
+		placeholder="http://127.0.0.1:8765",
+		help="Run 'python count_service.py' and enter its URL to count on the shared service"
+	).strip().rstrip('/')
+
+	st.markdown("---")
+	st.caption("💡 Tip: Edit rates, file type multipliers and band weights in rates.json")
 
 # File uploader
 st.subheader("📁 Upload Files")
 uploaded_files = st.file_uploader(
 	"Choose localization files to analyze",
-	type=['json', 'xml', 'xlf', 'docx', 'pdf'],
+	type=[ext.lstrip('.') for ext in SEGMENT_READERS],
 	accept_multiple_files=True,
-	help="Supported formats: JSON, XML, XLF, DOCX, PDF"
+	help="Supported formats: JSON, XML, XLF/XLIFF, TMX, PO/POT, STRINGS, XCSTRINGS, DOCX, PDF"
 )
+st.caption("Uploads are held in memory for the session, up to the server's maxUploadSize. "
+		   "For very large handoffs, count the folder with multi_format_counter.py or the count service.")
 
 if uploaded_files:
 
-	# Process files
-	with st.spinner("Processing files..."):
-		results = []
+	# Counts are kept in the session, so reruns from widgets (what-if slider, language
+	# selection) re-price the cached results instead of re-parsing every upload
+	count_key = (tuple(getattr(file, 'file_id', None) or (file.name, file.size) for file in uploaded_files),
+				 analyze_repetitions, service_url)
+	if st.session_state.get('count_key') == count_key:
+		results = st.session_state['count_results']
+	else:
+		# Process files
+		with st.spinner("Processing files..."):
+			results = []
+
+			progress_bar = st.progress(0)
+			status_text = st.empty()
+			analyzer = RepetitionAnalyzer() if analyze_repetitions else None
+
+			if service_url:
+				def show_progress(job):
+					progress = job['progress']
+					if progress['total']:
+						progress_bar.progress(progress['done'] / progress['total'])
+					status_text.text(f"Service job {job['status']}: {progress['done']}/{progress['total'] or '?'} files")
+
+				try:
+					results = count_with_service(uploaded_files, service_url, analyze_repetitions, show_progress)
+				except Exception as e:
+					st.error(f"Count service failed: {e}")
+			else:
+				live_table = st.empty()
 
-		progress_bar = st.progress(0)
-		status_text = st.empty()
+				def show_progress(fraction, status):
+					progress_bar.progress(fraction)
+					status_text.text(status)
 
-		for idx, file in enumerate(uploaded_files):
-			status_text.text(f"Processing: {file.name}")
-			result = count_words_in_file(file)
-			if result:
-				results.append(result)
-			progress_bar.progress((idx + 1) / len(uploaded_files))
+				def show_results(results_so_far):
+					live_table.dataframe(pd.DataFrame(results_so_far), use_container_width=True, hide_index=True)
 
-		status_text.empty()
-		progress_bar.empty()
+				results = count_uploads(uploaded_files, analyzer, show_progress, show_results)
+				live_table.empty()
+
+			status_text.empty()
+			progress_bar.empty()
+
+		if results:
+			st.session_state['count_key'] = count_key
+			st.session_state['count_results'] = results
 
 	if results:
 		# Calculate totals
 		total_words = sum(r['words'] for r in results)
+		engine = CostEngine(results, RATE_TABLE)
+		billable_words = engine.weighted_words.sum()
 
 		st.success(f"✅ Processed {len(results)} file(s) successfully")
 
@@ -344,6 +438,8 @@ if uploaded_files:
 
 		with col2:
 			st.metric("Total Words", f"{total_words:,}")
+			if analyze_repetitions:
+				st.caption(f"Weighted: {billable_words:,.0f} words")
 
 		with col3:
 			st.metric("Target Languages", len(selected_languages))
@@ -356,7 +452,8 @@ if uploaded_files:
 		df_files = df_files.rename(columns={
 			'filename': 'File Name',
 			'file_type': 'Type',
-			'words': 'Words'
+			'words': 'Words',
+			'weighted_words': 'Weighted Words'
 		})
 
 		st.dataframe(
@@ -370,37 +467,36 @@ if uploaded_files:
 			st.markdown("---")
 			st.subheader("💰 Cost Estimation")
 
-			language_costs, total_cost = calculate_costs(
-				total_words,
-				selected_languages,
-				LANGUAGE_RATES
-			)
+			df_costs, total_cost = calculate_costs(engine, selected_languages)
 
 			# Cost breakdown
-			cost_data = []
-			for lang in selected_languages:
-				cost_data.append({
-					'Target Language': lang,
-					'Rate ($/word)': f"${LANGUAGE_RATES[lang]:.2f}",
-					'Words': f"{total_words:,}",
-					'Total Cost': f"${language_costs[lang]:,.2f}"
-				})
-
-			df_costs = pd.DataFrame(cost_data)
-
 			st.dataframe(
-				df_costs,
+				df_costs.style.format({
+					engine.rate_column: lambda rate: format_cost(rate, engine.currency),
+					'Source Words': '{:,.0f}',
+					'Billable Words': '{:,.1f}',
+					engine.cost_column: lambda cost: format_cost(cost, engine.currency)
+				}),
 				use_container_width=True,
 				hide_index=True
 			)
 
 			# Total cost highlight
 			st.markdown("### 💵 Total Translation Cost")
-			st.markdown(f"## ${total_cost:,.2f}")
+			st.markdown(f"## {format_cost(total_cost, engine.currency)}")
+
+			# What-if: rates are re-applied to the session's cached counts, no re-count needed
+			rate_change = st.slider("What-if rate change (%)", min_value=-50, max_value=50, value=0, step=5)
+			if rate_change:
+				what_if_rates = {lang: LANGUAGE_RATES[lang] * (1 + rate_change / 100) for lang in selected_languages}
+				df_what_if = engine.what_if(what_if_rates, selected_languages)
+				what_if_total = df_what_if[engine.cost_column].sum()
+				st.metric("What-if Total Cost", format_cost(what_if_total, engine.currency),
+						  f"{what_if_total - total_cost:+,.2f}")
 
 			# Time estimate
 			words_per_hour = 250
-			total_hours = (total_words * len(selected_languages)) / words_per_hour
+			total_hours = (billable_words * len(selected_languages)) / words_per_hour
 			total_days = total_hours / 8
 
 			col1, col2 = st.columns(2)
@@ -421,8 +517,7 @@ if uploaded_files:
 						excel_file = create_excel_report(
 							results,
 							selected_languages,
-							language_costs,
-							total_words
+							engine
 						)
 
 						filename = f"localization_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx"
@@ -438,7 +533,7 @@ if uploaded_files:
 						st.success("✅ Report ready for download!")
 
 			with col2:
-				st.info("💡 The Excel report includes:\n- File analysis\n- Cost breakdown by language\n- Summary sheet")
+				st.info("💡 The Excel report includes:\n- File analysis\n- Cost breakdown by language\n- Cost by file and language\n- Summary sheet")
 
 		else:
 			st.warning("⚠️ Please select at least one target language to calculate costs.")
@@ -467,4 +562,4 @@ else:
 
 # Footer
 st.markdown("---")
-st.caption(f"💡 Edit language rates in the script • Source: {SOURCE_LANGUAGE}")
\ No newline at end of file
+st.caption(f"💡 Edit language rates in rates.json • Source: {SOURCE_LANGUAGE}")
\ No newline at end of file
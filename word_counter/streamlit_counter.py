@@ -1,11 +1,7 @@
 import streamlit as st
-import os
-import json
-import xml.etree.ElementTree as ET
-from docx import Document
-import PyPDF2
 import pandas as pd
 from datetime import datetime
+from segments import SEGMENT_READERS, get_reader
 
 st.set_page_config(page_title="Word Counter", page_icon="📝", layout="wide")
 
@@ -15,31 +11,27 @@ st.write("Upload your localization files to count words and estimate costs")
 # File uploader
 uploaded_files = st.file_uploader(
 	"Choose files",
-	type=['json', 'xml', 'xlf', 'docx', 'pdf'],
+	type=[ext.lstrip('.') for ext in SEGMENT_READERS],
 	accept_multiple_files=True
 )
 
 
-def count_words(file, file_type):
-	"""Count words from uploaded file"""
-	try:
-		if file_type == 'json':
-			data = json.load(file)
-			# Extract strings logic here
-			text = str(data)  # Simplified
-		elif file_type in ['xml', 'xlf']:
-			tree = ET.parse(file)
-			text = ' '.join([elem.text for elem in tree.iter() if elem.text])
-		elif file_type == 'docx':
-			doc = Document(file)
-			text = ' '.join([p.text for p in doc.paragraphs])
-		elif file_type == 'pdf':
-			pdf = PyPDF2.PdfReader(file)
-			text = ' '.join([page.extract_text() for page in pdf.pages])
+def count_words(file):
+	"""Count words from an uploaded file with the shared segment extractors
 
-		return len(text.split())
-	except:
-		return 0
+	Returns:
+		(file type, words), or None if the file is unsupported or unreadable
+	"""
+	reader = get_reader(file.name)
+	if reader is None:
+		st.warning(f"⚠️ Unsupported file type: {file.name}")
+		return None
+	file_type, iter_file_segments = reader
+	try:
+		return file_type, sum(segment.words for segment in iter_file_segments(file))
+	except Exception as e:
+		st.error(f"Error reading {file_type} ({file.name}): {e}")
+		return None
 
 
 if uploaded_files:
@@ -47,17 +39,19 @@ if uploaded_files:
 
 	with st.spinner("Processing files..."):
 		for file in uploaded_files:
-			ext = file.name.split('.')[-1].lower()
-			words = count_words(file, ext)
+			counted = count_words(file)
+			if counted is None:
+				continue
+			file_type, words = counted
 			results.append({
 				'File Name': file.name,
-				'Type': ext.upper(),
+				'Type': file_type,
 				'Words': words,
 				'Cost (USD)': round(words * 0.15, 2)
 			})
 
 	# Display results
-	df = pd.DataFrame(results)
+	df = pd.DataFrame(results, columns=['File Name', 'Type', 'Words', 'Cost (USD)'])
 
 	st.success(f"✅ Processed {len(results)} files")
 
@@ -0,0 +1,189 @@
+"""
+Memoized per-string analysis shared by the counters and QA
+
+Game string tables repeat the same short strings ("OK", "Cancel", "Level {level}")
+thousands of times. analyze_string tokenizes each distinct string once and serves
+repeats from a size-bounded LRU cache; strings longer than MAX_CACHED_LENGTH
+(document paragraphs, PDF pages) are analyzed directly so the cache's memory
+ceiling stays fixed.
+"""
+
+import re
+from collections import namedtuple
+from functools import lru_cache
+
+CACHE_SIZE = 65536
+MAX_CACHED_LENGTH = 512
+
+# HTML and Unity rich text tags: <b>, </b>, <a href="...">, <color=#ff0000>, <br/>
+TAG_PATTERN = re.compile(r"<(/?)([A-Za-z][\w:.-]*)([^<>]*?)(/?)>")
+_ATTRIBUTE_PATTERN = re.compile(r"""([\w:.-]+)\s*=\s*("[^"]*"|'[^']*'|[^\s"'>]+)|([\w:.-]+)""")
+
+# Tags that never take a closing tag (HTML void elements, Unity sprites/quads)
+VOID_TAGS = frozenset(['area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input', 'link', 'meta',
+					   'source', 'track', 'wbr', 'sprite', 'quad', 'space', 'page'])
+
+# One scan finds {{double}} placeholders, printf forms (%s, %d, %.2f, positional %1$s,
+# Qt-style %1), '%%' escapes and single braces; brace depth is tracked while walking
+# the matches so ICU arguments ({count, plural, one {...} other {...}}) nest correctly.
+# A printf conversion must not run into a letter, so text like '50%off' is not a placeholder.
+PLACEHOLDER_TOKEN = re.compile(
+	r"\{\{[^{}]*\}\}"
+	r"|%%"
+	r"|%(?:\d+\$)?[-+#0]*(?:\d+|\*)?(?:\.\d+)?(?:hh|h|ll|l|L|q|z|j|t)?[diouxXeEfFgGaAcspn@](?![A-Za-z])"
+	r"|%\d+"
+	r"|[{}]")
+
+# Tags and {placeholders} removed in one scan when stripping markup for word counts
+_STRIP_PATTERN = re.compile(r"<[^>]+>|\{[^}]+\}")
+
+# Cached values are shared, so sequences are tuples
+StringAnalysis = namedtuple('StringAnalysis', ['cleaned', 'words', 'clean_words', 'placeholders',
+											   'tags', 'markup_errors'])
+
+# kind: 'open', 'close' or 'void'; attrs: sorted (name, value) pairs, where a Unity
+# value tag like <color=red> has the attribute ('', 'red')
+Tag = namedtuple('Tag', ['name', 'kind', 'attrs', 'raw'])
+
+
+def extract_placeholders(text):
+	"""Return the placeholders of a string, in order
+
+	ICU arguments are reduced to '{name, type}' since their branches are translated.
+	"""
+	placeholders = []
+	depth = 0
+	start = 0
+	for match in PLACEHOLDER_TOKEN.finditer(text):
+		token = match.group()
+		if token == '{':
+			if not depth:
+				start = match.start()
+			depth += 1
+		elif token == '}':
+			if not depth:
+				continue
+			depth -= 1
+			if not depth:
+				parts = [part.strip() for part in text[start + 1:match.start()].split(',')]
+				placeholders.append('{' + ', '.join(parts[:2]) + '}')
+		elif depth or token == '%%':
+			continue
+		elif token.startswith('{{'):
+			placeholders.append('{{' + token[2:-2].strip() + '}}')
+		else:
+			placeholders.append(token)
+	return placeholders
+
+
+def _unquote(value):
+	if len(value) >= 2 and value[0] == value[-1] and value[0] in '"\'':
+		return value[1:-1]
+	return value
+
+
+def _parse_attributes(text):
+	text = text.strip()
+	if text.startswith('='):
+		return (('', _unquote(text[1:].strip())),)
+	attrs = []
+	for match in _ATTRIBUTE_PATTERN.finditer(text):
+		if match.group(1):
+			attrs.append((match.group(1).lower(), _unquote(match.group(2))))
+		else:
+			attrs.append((match.group(3).lower(), ''))
+	return tuple(sorted(attrs))
+
+
+def parse_markup(text):
+	"""Tokenize the tags of a string and check their structure with a tag stack
+
+	Returns:
+		(tuple of Tag, tuple of structural errors): 'unclosed' (open tag never closed),
+		'unexpected_close' (close tag with no open tag) and 'misnested' (<b><i></b></i>)
+	"""
+	tags = []
+	errors = set()
+	stack = []
+	for match in TAG_PATTERN.finditer(text):
+		closing, name, rest, self_closing = match.groups()
+		name = name.lower()
+		if closing:
+			tags.append(Tag(name, 'close', (), match.group()))
+			if stack and stack[-1] == name:
+				stack.pop()
+			elif name in stack:
+				errors.add('misnested')
+				while stack.pop() != name:
+					pass
+			elif name not in VOID_TAGS:
+				errors.add('unexpected_close')
+			continue
+
+		if self_closing or name in VOID_TAGS:
+			tags.append(Tag(name, 'void', _parse_attributes(rest), match.group()))
+		else:
+			tags.append(Tag(name, 'open', _parse_attributes(rest), match.group()))
+			stack.append(name)
+	if stack:
+		errors.add('unclosed')
+	return tuple(tags), tuple(sorted(errors))
+
+
+def is_sequential_placeholder(placeholder):
+	"""True for printf placeholders filled by argument order (%s, %d), whose order matters"""
+	return placeholder.startswith('%') and '$' not in placeholder and not placeholder[1:].isdigit()
+
+
+def strip_markup(text):
+	"""Remove tags and {placeholders} and collapse whitespace, in a single regex pass"""
+	return ' '.join(_STRIP_PATTERN.sub('', text).split())
+
+
+def _analyze(text):
+	cleaned = strip_markup(text)
+	tags, markup_errors = parse_markup(text)
+	return StringAnalysis(
+		cleaned=cleaned,
+		words=len(text.split()),
+		clean_words=len(cleaned.split()),
+		placeholders=tuple(extract_placeholders(text)),
+		tags=tags,
+		markup_errors=markup_errors,
+	)
+
+
+_cached_analyze = lru_cache(maxsize=CACHE_SIZE)(_analyze)
+
+
+def analyze_string(text):
+	"""Return the StringAnalysis of a string
+
+	Fields:
+		cleaned: Text with tags and {placeholders} removed and whitespace collapsed
+		words: Word count of the raw text
+		clean_words: Word count of the cleaned text
+		placeholders: {name}, {{name}}, ICU and printf placeholders, in order
+		tags: HTML/Unity Tag tuples, in order
+		markup_errors: Structural tag errors from parse_markup
+	"""
+	if len(text) > MAX_CACHED_LENGTH:
+		return _analyze(text)
+	return _cached_analyze(text)
+
+
+def cache_stats():
+	"""Return hits, misses, size and hit rate of the string cache"""
+	info = _cached_analyze.cache_info()
+	lookups = info.hits + info.misses
+	return {
+		'hits': info.hits,
+		'misses': info.misses,
+		'size': info.currsize,
+		'max_size': info.maxsize,
+		'hit_rate': info.hits / lookups if lookups else 0.0,
+	}
+
+
+def clear_cache():
+	_cached_analyze.cache_clear()
@@ -0,0 +1,253 @@
+"""
+Local translation memory for TM leverage reports
+
+Loads previously translated pairs (XLIFF <source>/<target>, or a source JSON plus
+its translated JSON) into an on-disk SQLite index:
+- units: one row per unique normalized source, keyed by its hash
+- ngrams: inverted index of character trigram hashes -> unit, used for fuzzy lookup
+- gram_counts: number of units per trigram, so a fuzzy lookup only reads the posting
+  lists of the query's rarest trigrams
+
+Usage:
+	python translation_memory.py my_tm.db previous_release.xlf en-US.json,ko-KR.json
+"""
+
+import os
+import sys
+import zlib
+import sqlite3
+import xml.etree.ElementTree as ET
+from difflib import SequenceMatcher
+from repetition_analyzer import FUZZY_BANDS
+from segments import normalize_segment, segment_hash, iter_json_segments, _element_text
+
+DEFAULT_TM_PATH = 'translation_memory.db'
+
+# Lowest similarity (in %) still reported as a fuzzy TM match
+MIN_FUZZY_SCORE = FUZZY_BANDS[-1][0]
+
+# Units per max_candidates kept from the rare-gram posting lists for a full n-gram count
+PREFIX_CANDIDATES = 20
+
+
+def _local_name(tag):
+	"""Strip the {namespace} prefix from an ElementTree tag"""
+	return tag.rsplit('}', 1)[-1].lower()
+
+
+class TranslationMemory:
+	"""On-disk translation memory with exact (hash) and fuzzy (trigram) lookup"""
+
+	def __init__(self, db_path=DEFAULT_TM_PATH, ngram_size=3, max_candidates=5):
+		"""
+		Args:
+			db_path: SQLite file holding the index (created if missing)
+			ngram_size: Character n-gram size of the fuzzy index
+			max_candidates: Number of best n-gram candidates scored with an exact similarity
+		"""
+		self.db_path = db_path
+		self.ngram_size = ngram_size
+		self.max_candidates = max_candidates
+
+		self.conn = sqlite3.connect(db_path)
+		self.conn.executescript("""
+			CREATE TABLE IF NOT EXISTS units (
+				id INTEGER PRIMARY KEY,
+				hash BLOB UNIQUE NOT NULL,
+				source TEXT NOT NULL,
+				target TEXT NOT NULL,
+				origin TEXT
+			);
+			CREATE TABLE IF NOT EXISTS ngrams (
+				gram INTEGER NOT NULL,
+				unit_id INTEGER NOT NULL
+			);
+			CREATE TABLE IF NOT EXISTS gram_counts (
+				gram INTEGER PRIMARY KEY,
+				units INTEGER NOT NULL
+			);
+			CREATE INDEX IF NOT EXISTS idx_ngrams_gram_unit ON ngrams (gram, unit_id);
+		""")
+
+	def close(self):
+		self.conn.close()
+
+	def __enter__(self):
+		return self
+
+	def __exit__(self, *exc):
+		self.close()
+
+	def __len__(self):
+		return self.conn.execute("SELECT COUNT(*) FROM units").fetchone()[0]
+
+	def _grams(self, normalized):
+		text = normalized.casefold()
+		size = self.ngram_size
+		if len(text) <= size:
+			grams = {text}
+		else:
+			grams = {text[i:i + size] for i in range(len(text) - size + 1)}
+		return {zlib.crc32(g.encode('utf-8')) for g in grams}
+
+	def add(self, source, target, origin=None):
+		"""Add one translated pair; the first translation of a source wins
+
+		Returns:
+			True if the pair was added, False if the source was already in the TM
+		"""
+		normalized = normalize_segment(source)
+		if not normalized or not target.strip():
+			return False
+
+		cursor = self.conn.execute(
+			"INSERT OR IGNORE INTO units (hash, source, target, origin) VALUES (?, ?, ?, ?)",
+			(segment_hash(source), normalized, target, origin)
+		)
+		if not cursor.rowcount:
+			return False
+
+		unit_id = cursor.lastrowid
+		grams = self._grams(normalized)
+		self.conn.executemany("INSERT INTO ngrams (gram, unit_id) VALUES (?, ?)",
+							  ((gram, unit_id) for gram in grams))
+		self.conn.executemany(
+			"INSERT INTO gram_counts (gram, units) VALUES (?, 1) "
+			"ON CONFLICT (gram) DO UPDATE SET units = units + 1",
+			((gram,) for gram in grams))
+		return True
+
+	def import_xliff(self, filepath):
+		"""Import <source>/<target> pairs from an XLIFF file (1.2 trans-unit or 2.0 segment)"""
+		origin = os.path.basename(filepath)
+		added = 0
+
+		for _, elem in ET.iterparse(filepath, events=('end',)):
+			if _local_name(elem.tag) not in ('trans-unit', 'segment'):
+				continue
+			source = target = None
+			for child in elem:
+				name = _local_name(child.tag)
+				# Same text as the counters see: native codes (<bpt>, <ph>, ...) dropped,
+				# so a tagged unit hash-matches its own TM entry
+				if name == 'source':
+					source = _element_text(child)
+				elif name == 'target':
+					target = _element_text(child)
+			if source and target:
+				added += self.add(source, target, origin)
+			elem.clear()
+
+		self.conn.commit()
+		return added
+
+	def import_json_pair(self, source_file, target_file):
+		"""Import strings from a source JSON and its translated JSON, aligned by key path"""
+		source_data = {segment.key: segment.text for segment in iter_json_segments(source_file)}
+		target_data = {segment.key: segment.text for segment in iter_json_segments(target_file)}
+
+		origin = os.path.basename(target_file)
+		added = 0
+		for key, source in source_data.items():
+			target = target_data.get(key)
+			if target:
+				added += self.add(source, target, origin)
+
+		self.conn.commit()
+		return added
+
+	def lookup(self, text):
+		"""Find the best TM match for a segment
+
+		Returns:
+			(score, source, target) with score in 0-100, or None below MIN_FUZZY_SCORE
+		"""
+		normalized = normalize_segment(text)
+		if not normalized:
+			return None
+
+		row = self.conn.execute("SELECT source, target FROM units WHERE hash = ?",
+								(segment_hash(text),)).fetchone()
+		if row:
+			return 100, row[0], row[1]
+
+		# Candidates must share at least half of the query's n-grams. Grams not in the TM
+		# cannot be shared, and a unit sharing `required` of the remaining grams must hold
+		# one of the (len - required + 1) rarest, so only those posting lists are read.
+		# The units sharing most of these rare grams get their full count by index probes.
+		grams = self._grams(normalized)
+		required = max(1, len(grams) // 2)
+		placeholders = ','.join('?' * len(grams))
+		known = [gram for gram, _ in self.conn.execute(
+			f"SELECT gram, units FROM gram_counts WHERE gram IN ({placeholders}) ORDER BY units",
+			tuple(grams))]
+		if len(known) < required:
+			return None
+
+		prefix = known[:len(known) - required + 1]
+		rows = self.conn.execute(f"""
+			SELECT units.source, units.target
+			FROM (
+				SELECT unit_id, COUNT(*) AS shared FROM ngrams
+				WHERE gram IN ({','.join('?' * len(known))})
+				AND unit_id IN (
+					SELECT unit_id FROM ngrams WHERE gram IN ({','.join('?' * len(prefix))})
+					GROUP BY unit_id
+					ORDER BY COUNT(*) DESC
+					LIMIT ?
+				)
+				GROUP BY unit_id
+				HAVING shared >= ?
+				ORDER BY shared DESC
+				LIMIT ?
+			) AS hits
+			JOIN units ON units.id = hits.unit_id
+		""", (*known, *prefix, self.max_candidates * PREFIX_CANDIDATES, required,
+			   self.max_candidates)).fetchall()
+
+		best = None
+		for source, target in rows:
+			score = SequenceMatcher(None, normalized, source, autojunk=False).ratio() * 100
+			# Only exact hash hits are 100%
+			score = min(score, 99)
+			if score >= MIN_FUZZY_SCORE and (best is None or score > best[0]):
+				best = (score, source, target)
+		return best
+
+	def match_type(self, text):
+		"""Return the leverage bucket of a segment: tm_matched_words, tm_fuzzy_words or new_words"""
+		match = self.lookup(text)
+		if match is None:
+			return 'new_words'
+		if match[0] == 100:
+			return 'tm_matched_words'
+		return 'tm_fuzzy_words'
+
+	def leverage(self, segments):
+		"""Split the words of a file into TM-matched, fuzzy and new words
+
+		Returns:
+			Dict with tm_matched_words (100%), tm_fuzzy_words (75-99%) and new_words
+		"""
+		report = {'tm_matched_words': 0, 'tm_fuzzy_words': 0, 'new_words': 0}
+		for text in segments:
+			words = len(text.split())
+			if words:
+				report[self.match_type(text)] += words
+		return report
+
+
+if __name__ == '__main__':
+	if len(sys.argv) < 3:
+		print("Usage: python translation_memory.py <tm.db> <file.xlf | source.json,target.json> ...")
+		sys.exit(1)
+
+	with TranslationMemory(sys.argv[1]) as tm:
+		for item in sys.argv[2:]:
+			if ',' in item:
+				source_file, target_file = item.split(',', 1)
+				added = tm.import_json_pair(source_file, target_file)
+			else:
+				added = tm.import_xliff(item)
+			print(f" ✓ {item}: {added:,} new TM unit(s)")
+		print(f"\nTM now holds {len(tm):,} unit(s): {tm.db_path}")
@@ -0,0 +1,251 @@
+"""
+Word-level diff between two versions of localization files
+
+Segments of the old and new version are aligned with hashed maps in linear time:
+- by key (JSON paths, XLIFF ids, Android names, PO msgids); repeated keys are
+  paired by occurrence
+- by sequence for formats whose keys are only positions (DOCX paragraphs, PDF
+  pages): identical segments are matched by hash wherever they moved, and the
+  leftovers are paired in order when they are similar enough to be edits
+
+Each file reports added, removed, modified and unchanged words, plus the words
+actually changed inside modified segments (added + changed = words to translate).
+
+Usage:
+	python version_diff.py <old file or folder> <new file or folder>
+"""
+
+import os
+import sys
+from collections import Counter, defaultdict
+from difflib import SequenceMatcher
+from datetime import datetime
+import pandas as pd
+from file_walker import walk_files
+from segments import SUPPORTED_PATTERNS, normalize_segment, segment_hash, get_reader
+
+# File types whose keys are positions, not string IDs
+SEQUENCE_FILE_TYPES = ('DOCX', 'PDF')
+
+# Minimum word similarity for two unkeyed segments to count as an edit
+MIN_EDIT_SIMILARITY = 0.5
+
+DIFF_COLUMNS = ['added_words', 'removed_words', 'modified_words', 'changed_words', 'unchanged_words',
+				'added_segments', 'removed_segments', 'modified_segments']
+
+
+def _changed_words(old_text, new_text):
+	"""Words of new_text that were inserted or replaced relative to old_text"""
+	old_words = old_text.split()
+	new_words = new_text.split()
+	matcher = SequenceMatcher(None, old_words, new_words, autojunk=False)
+	unchanged = sum(block.size for block in matcher.get_matching_blocks())
+	return len(new_words) - unchanged
+
+
+def _similarity(old_text, new_text):
+	matcher = SequenceMatcher(None, old_text.split(), new_text.split(), autojunk=False)
+	if matcher.real_quick_ratio() < MIN_EDIT_SIMILARITY or matcher.quick_ratio() < MIN_EDIT_SIMILARITY:
+		return 0.0
+	return matcher.ratio()
+
+
+def _new_diff():
+	return dict.fromkeys(DIFF_COLUMNS, 0)
+
+
+def _add(diff, kind, text):
+	diff[f'{kind}_words'] += len(text.split())
+	if kind != 'unchanged':
+		diff[f'{kind}_segments'] += 1
+
+
+def _modified(diff, old_text, new_text):
+	_add(diff, 'modified', new_text)
+	diff['changed_words'] += _changed_words(old_text, new_text)
+
+
+def diff_by_key(old_segments, new_segments):
+	"""Diff two segment streams aligned by key"""
+	diff = _new_diff()
+
+	# (key, occurrence) -> text of the old version
+	old_map = {}
+	occurrences = defaultdict(int)
+	for segment in old_segments:
+		index = occurrences[segment.key]
+		occurrences[segment.key] += 1
+		old_map[(segment.key, index)] = segment.text
+
+	occurrences.clear()
+	for segment in new_segments:
+		index = occurrences[segment.key]
+		occurrences[segment.key] += 1
+		old_text = old_map.pop((segment.key, index), None)
+		if old_text is None:
+			_add(diff, 'added', segment.text)
+		elif old_text == segment.text or normalize_segment(old_text) == normalize_segment(segment.text):
+			_add(diff, 'unchanged', segment.text)
+		else:
+			_modified(diff, old_text, segment.text)
+
+	for old_text in old_map.values():
+		_add(diff, 'removed', old_text)
+	return diff
+
+
+def diff_by_sequence(old_segments, new_segments):
+	"""Diff two segment streams without usable keys"""
+	diff = _new_diff()
+	old_list = [(segment_hash(segment.text), segment.text) for segment in old_segments]
+	new_list = [(segment_hash(segment.text), segment.text) for segment in new_segments]
+
+	# Identical segments match wherever they moved
+	common = Counter(h for h, _ in old_list) & Counter(h for h, _ in new_list)
+	remaining = common.copy()
+	old_left = []
+	for position, (h, text) in enumerate(old_list):
+		if remaining[h]:
+			remaining[h] -= 1
+		else:
+			old_left.append((position / max(len(old_list), 1), text))
+	remaining = common
+	new_left = []
+	for position, (h, text) in enumerate(new_list):
+		if remaining[h]:
+			remaining[h] -= 1
+			_add(diff, 'unchanged', text)
+		else:
+			new_left.append((position / max(len(new_list), 1), text))
+
+	# Pair the leftovers in document order: similar pairs are edits, the rest
+	# are removed or added, advancing whichever side is earlier in its file
+	i = j = 0
+	while i < len(old_left) and j < len(new_left):
+		old_position, old_text = old_left[i]
+		new_position, new_text = new_left[j]
+		if _similarity(old_text, new_text) >= MIN_EDIT_SIMILARITY:
+			_modified(diff, old_text, new_text)
+			i += 1
+			j += 1
+		elif old_position <= new_position:
+			_add(diff, 'removed', old_text)
+			i += 1
+		else:
+			_add(diff, 'added', new_text)
+			j += 1
+	for _, old_text in old_left[i:]:
+		_add(diff, 'removed', old_text)
+	for _, new_text in new_left[j:]:
+		_add(diff, 'added', new_text)
+	return diff
+
+
+def diff_files(old_path, new_path, align=None):
+	"""Diff two versions of a file
+
+	Args:
+		old_path: Previous version (None if the file is new)
+		new_path: Current version (None if the file was deleted)
+		align: 'key' or 'sequence' (default: by file type)
+
+	Returns:
+		Dict with filename, file_type and the DIFF_COLUMNS counts
+	"""
+	path = new_path or old_path
+	file_type, iter_file_segments = get_reader(path)
+	if align is None:
+		align = 'sequence' if file_type in SEQUENCE_FILE_TYPES else 'key'
+
+	old_segments = iter_file_segments(old_path) if old_path else []
+	new_segments = iter_file_segments(new_path) if new_path else []
+	if align == 'sequence':
+		diff = diff_by_sequence(old_segments, new_segments)
+	else:
+		diff = diff_by_key(old_segments, new_segments)
+
+	return {'filename': os.path.basename(path), 'file_type': file_type, **diff}
+
+
+def diff_folders(old_folder, new_folder, file_patterns=None, exclude=None):
+	"""Diff every supported file of two release folders, matched by relative path
+
+	Files only in the new folder count as added, files only in the old one as removed.
+	"""
+	file_patterns = file_patterns or SUPPORTED_PATTERNS
+	old_files = {os.path.relpath(path, old_folder): path
+				 for path in walk_files(old_folder, include=file_patterns, exclude=exclude)}
+	new_files = {os.path.relpath(path, new_folder): path
+				 for path in walk_files(new_folder, include=file_patterns, exclude=exclude)}
+
+	results = []
+	for rel_path in sorted(old_files.keys() | new_files.keys()):
+		print(f" Diffing: {rel_path}")
+		try:
+			result = diff_files(old_files.get(rel_path), new_files.get(rel_path))
+		except Exception as e:
+			print(f" X Error reading {rel_path}: {e}")
+			continue
+		result['filename'] = rel_path
+		results.append(result)
+	return results
+
+
+def display_diff(results):
+	if not results:
+		return
+	print("=" * 80)
+	print("VERSION DIFF")
+	print("=" * 80)
+	print(f"{'File Name':<32} {'Added':>9} {'Removed':>9} {'Modified':>9} {'Changed':>9} {'Same':>9}")
+	print("-" * 80)
+	for result in results:
+		print(f"{result['filename']:<32} "
+			  f"{result['added_words']:>9,} "
+			  f"{result['removed_words']:>9,} "
+			  f"{result['modified_words']:>9,} "
+			  f"{result['changed_words']:>9,} "
+			  f"{result['unchanged_words']:>9,}")
+	totals = {column: sum(result[column] for result in results) for column in DIFF_COLUMNS}
+	print("-" * 80)
+	print(f"{'TOTAL':<32} "
+		  f"{totals['added_words']:>9,} "
+		  f"{totals['removed_words']:>9,} "
+		  f"{totals['modified_words']:>9,} "
+		  f"{totals['changed_words']:>9,} "
+		  f"{totals['unchanged_words']:>9,}")
+	print("=" * 80)
+	print(f"\nWords to translate (added + changed): {totals['added_words'] + totals['changed_words']:,}")
+	print("=" * 80)
+
+
+def export_diff_to_excel(results):
+	if not results:
+		return
+	df = pd.DataFrame(results)
+	df = df.rename(columns={'filename': 'File Name', 'file_type': 'Type'})
+	df.columns = [column.replace('_', ' ').title() if column not in ('File Name', 'Type') else column
+				  for column in df.columns]
+	totals = {column: df[column].sum() for column in df.columns if column not in ('File Name', 'Type')}
+	totals.update({'File Name': 'TOTAL', 'Type': ''})
+	df = pd.concat([df, pd.DataFrame([totals])], ignore_index=True)
+
+	output_file = f"version_diff_{datetime.now().strftime('%Y%m%d-%H%M%S')}.xlsx"
+	df.to_excel(output_file, index=False, sheet_name='Version Diff')
+	print(f"\n✓ Excel report saved: {output_file}")
+	return output_file
+
+
+if __name__ == '__main__':
+	if len(sys.argv) != 3:
+		print(__doc__)
+		sys.exit(1)
+
+	old_path, new_path = sys.argv[1], sys.argv[2]
+	if os.path.isdir(old_path) and os.path.isdir(new_path):
+		results = diff_folders(old_path, new_path)
+	else:
+		results = [diff_files(old_path, new_path)]
+
+	display_diff(results)
+	export_diff_to_excel(results)